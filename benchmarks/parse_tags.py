@@ -0,0 +1,56 @@
+"""
+Times the tag string parser against its previous, character by character,
+implementation (kept in ``tests/test_utils.py``).
+
+Run from the repository root::
+
+    python benchmarks/parse_tags.py --tags 5000
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from taggit.utils import _parse_tags  # noqa: E402
+from tests.test_utils import character_parse_tags  # noqa: E402
+
+
+def tagstrings(tags):
+    names = ["tag number %d" % i for i in range(tags)]
+    return {
+        "space delimited": " ".join(name.replace(" ", "-") for name in names),
+        "comma delimited": ", ".join(names),
+        "quoted": " ".join('"%s"' % name for name in names),
+        "mixed": ", ".join(
+            '"%s, quoted"' % name if i % 2 else name for i, name in enumerate(names)
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tags", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{args.tags} tags per string (best of {args.repeat}, ms)")
+    print(f"{'':20}{'previous':>12}{'current':>12}")
+    for name, tagstring in tagstrings(args.tags).items():
+        assert _parse_tags(tagstring) == character_parse_tags(tagstring)
+        previous, current = (
+            min(timeit.repeat(lambda: func(tagstring), number=1, repeat=args.repeat))
+            for func in (character_parse_tags, _parse_tags)
+        )
+        print(f"{name:20}{previous * 1000:12.2f}{current * 1000:12.2f}")
+
+
+if __name__ == "__main__":
+    main()
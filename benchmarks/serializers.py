@@ -0,0 +1,91 @@
+"""
+Counts the queries (and times) serializing a list of tagged objects with
+``TaggitSerializer``, with and without ``TaggitListSerializer`` prefetching
+their tags.
+
+Run from the repository root::
+
+    python benchmarks/serializers.py --objects 1000
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+from rest_framework import serializers  # noqa: E402
+
+from tests.models import TestModel  # noqa: E402
+from tests.serializers import (  # noqa: E402
+    OrderedTestModelSerializer,
+    TestModelSerializer,
+)
+
+
+def without_prefetch(serializer_class):
+    meta = type("Meta", (serializer_class.Meta,), {})
+    meta.list_serializer_class = serializers.ListSerializer
+    return type(serializer_class.__name__, (serializer_class,), {"Meta": meta})
+
+
+def populate(objects, tags_per_object):
+    objs = TestModel.objects.bulk_create(TestModel() for _i in range(objects))
+    TestModel.tags.bulk_add(
+        [(obj, ["tag %d" % i for i in range(tags_per_object)]) for obj in objs]
+    )
+
+
+def measure(serializer_class, repeat):
+    def serialize():
+        return serializer_class(TestModel.objects.all(), many=True).data
+
+    with CaptureQueriesContext(connection) as queries:
+        serialize()
+    return len(queries), min(timeit.repeat(serialize, number=1, repeat=repeat)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--objects", type=int, default=1000)
+    parser.add_argument("--tags-per-object", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        populate(args.objects, args.tags_per_object)
+        results = {}
+        for name, serializer_class in [
+            ("TagListSerializerField", TestModelSerializer),
+            ("ordered TagListSerializerField", OrderedTestModelSerializer),
+        ]:
+            results[name] = (
+                measure(without_prefetch(serializer_class), args.repeat),
+                measure(serializer_class, args.repeat),
+            )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    print(
+        f"{connection.vendor}, {args.objects} objects, {args.tags_per_object} tags "
+        f"per object (queries, best of {args.repeat} in ms)"
+    )
+    print(f"{'':32}{'without prefetch':>24}{'with prefetch':>24}")
+    for name, ((queries, time), (prefetch_queries, prefetch_time)) in results.items():
+        print(
+            f"{name:32}{queries:>14}{time:10.2f}{prefetch_queries:>14}"
+            f"{prefetch_time:10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
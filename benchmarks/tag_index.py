@@ -0,0 +1,112 @@
+"""
+Times the usual "objects of a content type with a tag" reads with and without
+the ``(tag, content_type, object_id)`` index of ``TaggedItem``.
+
+Run from the repository root, against the test settings (or any settings
+module including the ``tests`` app, to benchmark another database)::
+
+    python benchmarks/tag_index.py --objects 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.contenttypes.models import ContentType  # noqa: E402
+from django.db import connection  # noqa: E402
+
+from taggit.models import Tag, TaggedItem  # noqa: E402
+from taggit.pagination import TagCursorPaginator  # noqa: E402
+from tests.models import Food  # noqa: E402
+from tests.views import FoodTagListView  # noqa: E402
+
+INDEX_FIELDS = ["tag", "content_type", "object_id"]
+
+
+def populate(objects, tags, tags_per_object):
+    Food.objects.bulk_create(Food(name="food %d" % i) for i in range(objects))
+    Tag.objects.bulk_create(
+        Tag(name="tag %d" % i, slug="tag-%d" % i) for i in range(tags)
+    )
+    tag_ids = list(Tag.objects.values_list("pk", flat=True))
+    content_type = ContentType.objects.get_for_model(Food)
+    rng = random.Random(0)
+    TaggedItem.objects.bulk_create(
+        (
+            TaggedItem(tag_id=tag_id, content_type=content_type, object_id=food_id)
+            for food_id in Food.objects.values_list("pk", flat=True).iterator()
+            for tag_id in rng.sample(tag_ids, tags_per_object)
+        ),
+        batch_size=5000,
+    )
+
+
+def benchmarks(tag):
+    view = FoodTagListView()
+    view.tag = tag
+    view.kwargs = {}
+    paginator = TagCursorPaginator(Food.objects.all(), tag, 20)
+    middle = paginator.get_rows().values_list("object_id", flat=True)
+    middle = middle[middle.count() // 2]
+    deep_cursor = paginator.encode_cursor(middle)
+    return {
+        "filter(tags__name=...)": lambda: list(
+            Food.objects.filter(tags__name=tag.name).values_list("pk", flat=True)
+        ),
+        "TagListMixin.get_queryset()": lambda: list(
+            view.get_queryset().values_list("pk", flat=True)
+        ),
+        "TagCursorPaginator, deep page": lambda: list(paginator.page(deep_cursor)),
+    }
+
+
+def run(tag, repeat):
+    return {
+        name: min(timeit.repeat(func, number=1, repeat=repeat)) * 1000
+        for name, func in benchmarks(tag).items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--objects", type=int, default=20000)
+    parser.add_argument("--tags", type=int, default=200)
+    parser.add_argument("--tags-per-object", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        populate(args.objects, args.tags, args.tags_per_object)
+        tag = Tag.objects.order_by("pk").first()
+
+        with_index = run(tag, args.repeat)
+        index = next(
+            index for index in TaggedItem._meta.indexes if index.fields == INDEX_FIELDS
+        )
+        with connection.schema_editor() as schema_editor:
+            schema_editor.remove_index(TaggedItem, index)
+        without_index = run(tag, args.repeat)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    print(
+        f"{connection.vendor}, {args.objects} objects, {args.tags} tags, "
+        f"{args.tags_per_object} tags per object (best of {args.repeat}, ms)"
+    )
+    print(f"{'':32}{'without index':>15}{'with index':>15}")
+    for name in with_index:
+        print(f"{name:32}{without_index[name]:15.2f}{with_index[name]:15.2f}")
+
+
+if __name__ == "__main__":
+    main()
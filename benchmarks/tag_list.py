@@ -0,0 +1,100 @@
+"""
+Times the common ``TagList`` operations against its previous implementation.
+
+Run from the repository root::
+
+    python benchmarks/tag_list.py --tags 10
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from taggit.serializers import TagList  # noqa: E402
+
+
+class PreviousTagList(list):
+    def __init__(self, *args, **kwargs):
+        pretty_print = kwargs.pop("pretty_print", True)
+        super().__init__(*args, **kwargs)
+        self.pretty_print = pretty_print
+
+    def __add__(self, rhs):
+        return PreviousTagList(super().__add__(rhs))
+
+    def __getitem__(self, item):
+        result = super().__getitem__(item)
+        try:
+            return PreviousTagList(result)
+        except TypeError:
+            return result
+
+    def __str__(self):
+        if self.pretty_print:
+            return json.dumps(self, sort_keys=True, indent=4, separators=(",", ": "))
+        else:
+            return json.dumps(self)
+
+
+def benchmarks(tag_list_class, names):
+    tags = tag_list_class(names)
+    rows = [{"tags": tag_list_class(names)} for _i in range(1000)]
+    renderer = JSONRenderer()
+    return {
+        # as TagListSerializerField.to_representation() does
+        "build": lambda: tag_list_class([name for name in names], pretty_print=True),
+        "index": lambda: tags[0],
+        "slice": lambda: tags[:5],
+        "render 1000 rows (ms)": lambda: renderer.render(rows),
+    }
+
+
+def allocated(tag_list_class, names, count=1000):
+    tracemalloc.start()
+    tag_lists = [tag_list_class(names) for _i in range(count)]
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tag_lists
+    return size / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tags", type=int, default=10)
+    parser.add_argument("--number", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    names = ["tag %d" % i for i in range(args.tags)]
+    results = {}
+    for tag_list_class in (PreviousTagList, TagList):
+        for name, func in benchmarks(tag_list_class, names).items():
+            number = 10 if name.startswith("render") else args.number
+            best = min(timeit.repeat(func, number=number, repeat=args.repeat))
+            # µs per call, ms per call for the rendering
+            scale = 1000 if name.startswith("render") else 1000000
+            results.setdefault(name, []).append(best / number * scale)
+        results.setdefault("bytes per instance", []).append(
+            allocated(tag_list_class, names)
+        )
+
+    print(f"{args.tags} tags per list (best of {args.repeat}, µs per call)")
+    print(f"{'':24}{'previous':>12}{'current':>12}")
+    for name, (previous, current) in results.items():
+        print(f"{name:24}{previous:12.2f}{current:12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Times rendering and validating a form with many ``TagField``s, with the
+functions of ``TAGGIT_TAGS_FROM_STRING``/``TAGGIT_STRING_FROM_TAGS``
+resolved once or on every call (as they used to be).
+
+Run from the repository root::
+
+    python benchmarks/tag_widgets.py --fields 100
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django import forms  # noqa: E402
+from django.test import override_settings  # noqa: E402
+
+from taggit import utils  # noqa: E402
+from taggit.forms import TagField  # noqa: E402
+from taggit.models import Tag  # noqa: E402
+
+
+class UncachedFuncs(dict):
+    def __setitem__(self, key, value):
+        pass
+
+
+def tag_form(fields):
+    return type(
+        "TagForm",
+        (forms.Form,),
+        {"tags_%d" % i: TagField(required=False) for i in range(fields)},
+    )
+
+
+def benchmarks(fields):
+    form_class = tag_form(fields)
+    tags = [Tag(name="tag %d" % i) for i in range(5)]
+    initial = {name: tags for name in form_class.base_fields}
+    data = {name: "one, two, three" for name in form_class.base_fields}
+    return {
+        "render": lambda: str(form_class(initial=initial)),
+        "validate": lambda: form_class(data).is_valid(),
+    }
+
+
+def run(fields, repeat):
+    return {
+        name: min(timeit.repeat(func, number=1, repeat=repeat)) * 1000
+        for name, func in benchmarks(fields).items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fields", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{args.fields} tag fields (best of {args.repeat}, ms)")
+    print(f"{'':36}{'uncached':>12}{'cached':>12}")
+    for label, settings in [
+        ("default functions", {}),
+        (
+            "functions from settings",
+            {
+                "TAGGIT_TAGS_FROM_STRING": "taggit.utils._parse_tags",
+                "TAGGIT_STRING_FROM_TAGS": "taggit.utils._edit_string_for_tags",
+            },
+        ),
+    ]:
+        with override_settings(**settings):
+            with mock.patch.object(utils, "_funcs", UncachedFuncs()):
+                uncached = run(args.fields, args.repeat)
+            cached = run(args.fields, args.repeat)
+        for name in cached:
+            print(f"{label + ', ' + name:36}{uncached[name]:12.2f}{cached[name]:12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,8 @@
 from django.contrib import admin
-from django.db import transaction
 from django.shortcuts import redirect, render
 from django.urls import path
 
-from taggit.models import Tag, TaggedItem
+from taggit.models import Tag, TaggedItem, merge_tags
 
 from .forms import MergeTagsForm
 
@@ -52,23 +51,10 @@ class TagAdmin(admin.ModelAdmin):
             if form.is_valid():
                 new_tag_name = form.cleaned_data["new_tag_name"]
                 new_tag, created = Tag.objects.get_or_create(name=new_tag_name)
-                with transaction.atomic():
-                    for tag_id in selected_tag_ids:
-                        tag = Tag.objects.get(id=tag_id)
-                        tagged_items = TaggedItem.objects.filter(tag=tag)
-                        for tagged_item in tagged_items:
-                            if TaggedItem.objects.filter(
-                                tag=new_tag,
-                                content_type=tagged_item.content_type,
-                                object_id=tagged_item.object_id,
-                            ).exists():
-                                # we have the new tag as well, so we can just
-                                # remove the tag association
-                                tagged_item.delete()
-                            else:
-                                # point this taggedItem to the new one
-                                tagged_item.tag = new_tag
-                                tagged_item.save()
+                merge_tags(
+                    Tag.objects.filter(pk__in=[pk for pk in selected_tag_ids if pk]),
+                    new_tag,
+                )
 
                 self.message_user(request, "Tags have been merged", level="success")
                 # clear the selected_tag_ids from session after merge is complete
@@ -87,8 +73,8 @@ class TagAdmin(admin.ModelAdmin):
     @admin.action(description="Remove orphaned tags")
     def remove_orphaned_tags_action(self, request, queryset):
         try:
-            orphaned_tags = queryset.objects.orphaned()
-            count, _ = orphaned_tags.delete()
+            _deleted, rows = queryset.orphaned().delete()
+            count = rows.get(Tag._meta.label, 0)
             self.message_user(
                 request, f"Successfully removed {count} orphaned tags.", level="success"
             )
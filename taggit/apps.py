@@ -1,4 +1,6 @@
 from django.apps import AppConfig as BaseConfig
+from django.apps import apps
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.utils.translation import gettext_lazy as _
 
 
@@ -6,3 +8,15 @@ class TaggitAppConfig(BaseConfig):
     name = "taggit"
     verbose_name = _("Taggit")
     default_auto_field = "django.db.models.AutoField"
+
+    def ready(self):
+        from taggit.cache import invalidate_tag_cache
+        from taggit.managers import get_tags_fields, update_tag_counters_on_delete
+        from taggit.models import TagBase
+
+        for model in apps.get_models():
+            if issubclass(model, TagBase):
+                post_save.connect(invalidate_tag_cache, sender=model)
+                post_delete.connect(invalidate_tag_cache, sender=model)
+            if get_tags_fields(model):
+                pre_delete.connect(update_tag_counters_on_delete, sender=model)
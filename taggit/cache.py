@@ -0,0 +1,241 @@
+"""
+An optional cache of tag lookups by name, used when adding or setting tags.
+
+It is disabled by default. Set ``TAGGIT_TAG_CACHE_SIZE`` to the number of
+entries to keep in an in-process LRU cache, or ``TAGGIT_TAG_CACHE_ALIAS`` to
+the alias of one of your ``CACHES`` to share the entries between processes.
+
+Entries are dropped whenever a tag of the same model is saved or deleted
+(through ``post_save``/``post_delete``). Changes that don't send these
+signals, like ``QuerySet.update()``, need a call to ``clear_tag_cache()``.
+The in-process cache is only invalidated in the process making the change, so
+with several worker processes, use a shared cache instead.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+
+GENERATION_KEY = "taggit.tag_cache.generation:%s"
+
+
+class LocalTagCache:
+    """
+    A thread safe, size bounded, least recently used mapping.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # bumped by clear(), so that entries read before a clear aren't stored
+        # after it
+        self._clears = 0
+        self._label_clears = {}
+
+    def get_many(self, keys):
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[key] = self._entries[key]
+        return found
+
+    def generation(self, label):
+        """
+        Returns a value that changes whenever the entries of ``label`` are
+        cleared.
+        """
+        with self._lock:
+            return (self._clears, self._label_clears.get(label, 0))
+
+    def set_many(self, entries, max_size, label=None, generation=None):
+        """
+        Stores ``entries``, unless the entries of ``label`` were cleared since
+        ``generation`` was read.
+        """
+        with self._lock:
+            if label is not None and generation != (
+                self._clears,
+                self._label_clears.get(label, 0),
+            ):
+                return
+            for key, value in entries.items():
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self, label=None):
+        with self._lock:
+            if label is None:
+                self._clears += 1
+                self._entries.clear()
+            else:
+                self._label_clears[label] = self._label_clears.get(label, 0) + 1
+                for key in [key for key in self._entries if key[0] == label]:
+                    del self._entries[key]
+
+
+local_cache = LocalTagCache()
+
+
+def _get_shared_cache():
+    alias = getattr(settings, "TAGGIT_TAG_CACHE_ALIAS", None)
+    return caches[alias] if alias else None
+
+
+def _is_enabled():
+    if getattr(settings, "TAGGIT_TAG_CACHE_ALIAS", None):
+        return True
+    return bool(getattr(settings, "TAGGIT_TAG_CACHE_SIZE", None))
+
+
+def _label(tag_model):
+    # proxies share the rows (and so the cache entries) of their concrete model
+    return tag_model._meta.concrete_model._meta.label_lower
+
+
+def _make_keys(tag_model, using, field, values, tag_kwargs):
+    label = _label(tag_model)
+    extra = tuple(
+        sorted(
+            (key, str(getattr(value, "pk", value))) for key, value in tag_kwargs.items()
+        )
+    )
+    return {(label, using, field, extra, value): value for value in values}
+
+
+def _shared_key(generation, key):
+    digest = hashlib.md5(repr(key).encode(), usedforsecurity=False).hexdigest()
+    return f"taggit.tag_cache:{generation}:{digest}"
+
+
+def _get_generation(cache, tag_model):
+    return cache.get_or_set(GENERATION_KEY % _label(tag_model), 1, timeout=None)
+
+
+def get_tags(tag_model, using, field, values, tag_kwargs):
+    """
+    Returns a dict mapping the given values of ``field`` (``"name"``, or
+    ``"name_lower"`` for lowercased names) to the cached tags.
+
+    The tags only have their primary key, name and slug loaded, any other
+    field is deferred.
+    """
+    if not values or not _is_enabled():
+        return {}
+
+    keys = _make_keys(tag_model, using, field, values, tag_kwargs)
+    shared_cache = _get_shared_cache()
+    if shared_cache is None:
+        entries = local_cache.get_many(keys)
+    else:
+        generation = _get_generation(shared_cache, tag_model)
+        shared_keys = {_shared_key(generation, key): key for key in keys}
+        entries = {
+            shared_keys[shared_key]: entry
+            for shared_key, entry in shared_cache.get_many(shared_keys).items()
+        }
+
+    opts = tag_model._meta
+    loaded = {opts.pk.attname, "name", "slug"}
+    field_names = [f.attname for f in opts.concrete_fields if f.attname in loaded]
+    tags = {}
+    for key, entry in entries.items():
+        values_for_field = dict(zip(("pk", "name", "slug"), entry))
+        values_for_field[opts.pk.attname] = values_for_field.pop("pk")
+        tags[keys[key]] = tag_model.from_db(
+            using, field_names, [values_for_field[name] for name in field_names]
+        )
+    return tags
+
+
+def cache_tags(tag_model, using, field, tags_for_value, tag_kwargs):
+    """
+    Caches the tags of the ``{value: tag}`` dict ``tags_for_value``, once the
+    current transaction (if any) is committed.
+    """
+    if not tags_for_value or not _is_enabled():
+        return
+
+    keys = _make_keys(tag_model, using, field, tags_for_value, tag_kwargs)
+    entries = {
+        key: (
+            tags_for_value[value].pk,
+            tags_for_value[value].name,
+            tags_for_value[value].slug,
+        )
+        for key, value in keys.items()
+    }
+
+    # the tags may still be renamed or deleted before the transaction is
+    # committed, so the entries are written under the current generation and
+    # dropped by any invalidation in between
+    label = _label(tag_model)
+    shared_cache = _get_shared_cache()
+    if shared_cache is None:
+        generation = local_cache.generation(label)
+    else:
+        generation = _get_generation(shared_cache, tag_model)
+
+    def store():
+        if shared_cache is None:
+            local_cache.set_many(
+                entries, settings.TAGGIT_TAG_CACHE_SIZE, label, generation
+            )
+        else:
+            shared_cache.set_many(
+                {_shared_key(generation, key): entry for key, entry in entries.items()}
+            )
+
+    # tags created in a transaction that gets rolled back must not be cached
+    transaction.on_commit(store, using=using)
+
+
+def clear_tag_cache(tag_model=None):
+    """
+    Drops the cached tags of ``tag_model``, or of every tag model.
+    """
+    local_cache.clear(_label(tag_model) if tag_model is not None else None)
+    shared_cache = _get_shared_cache()
+    if shared_cache is None:
+        return
+    if tag_model is not None:
+        labels = {_label(tag_model)}
+    else:
+        # only the tags, the alias may hold sessions and the like
+        from taggit.models import TagBase
+
+        labels = {
+            _label(model) for model in apps.get_models() if issubclass(model, TagBase)
+        }
+    for label in labels:
+        key = GENERATION_KEY % label
+        shared_cache.add(key, 1, timeout=None)
+        try:
+            shared_cache.incr(key)
+        except ValueError:
+            # the key was evicted in between, which invalidates just as well
+            pass
+
+
+def invalidate_tag_cache(sender, **kwargs):
+    """
+    ``post_save``/``post_delete`` receiver for tag models.
+    """
+    if _is_enabled():
+        clear_tag_cache(sender)
+
+
+@receiver(setting_changed)
+def reset_tag_cache(setting, **kwargs):
+    if setting in ("TAGGIT_TAG_CACHE_SIZE", "TAGGIT_TAG_CACHE_ALIAS"):
+        local_cache.clear()
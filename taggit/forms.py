@@ -23,6 +23,15 @@ class TagField(forms.CharField):
     widget = TagWidget
 
     def clean(self, value):
+        # has_changed() cleans the same value again, reuse the result
+        cleaned = getattr(self, "_cleaned", None)
+        if cleaned is not None and cleaned[0] == value:
+            return list(cleaned[1])
+        tags = self._clean(value)
+        self._cleaned = (value, tuple(tags))
+        return tags
+
+    def _clean(self, value):
         value = super().clean(value)
         try:
             return parse_tags(value)
@@ -48,10 +57,14 @@ class TagField(forms.CharField):
         if not initial_value:
             initial_value = []
 
-        initial_value = [tag.name for tag in initial_value]
-        initial_value.sort()
-
-        return initial_value != data_value
+        if isinstance(data_value, str):
+            # invalid input, which can't match the initial tags
+            return True
+        if isinstance(initial_value, str):
+            initial_names = parse_tags(initial_value)
+        else:
+            initial_names = (tag.name for tag in initial_value)
+        return frozenset(initial_names) != frozenset(data_value)
 
 
 class MergeTagsForm(forms.Form):
@@ -1,83 +1,87 @@
+from itertools import groupby
+
 from django.conf import settings
 from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.db import DEFAULT_DB_ALIAS, models, transaction
+from django.db.models.functions import Lower
 
-from taggit.models import Tag, TaggedItem
+from taggit.models import Tag, _merge_tags
 
 
 class Command(BaseCommand):
     help = "Identify and remove duplicate tags based on case insensitivity"
 
-    def handle(self, *args, **kwargs):
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Number of duplicate tags merged per transaction. Defaults to 500.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the duplicate tags without merging them.",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help='Nominates a database to deduplicate. Defaults to the "default" '
+            "database.",
+        )
+
+    def handle(self, *args, **options):
         if not getattr(settings, "TAGGIT_CASE_INSENSITIVE", False):
             self.stdout.write(
                 self.style.ERROR("TAGGIT_CASE_INSENSITIVE is not enabled.")
             )
             return
 
-        tags = Tag.objects.all()
-        tag_dict = {}
+        using = options["database"]
+        chunk_size = max(options["chunk_size"], 1)
+        # maps each duplicate tag to the tag it is merged into, the earliest
+        # one of its name (which is also the one add() and set() pick)
+        targets = self._find_duplicates(using)
+        if options["dry_run"]:
+            self.stdout.write(
+                f"Would merge {len(targets)} duplicate tags into "
+                f"{len(set(targets.values()))} tags."
+            )
+            return
 
-        for tag in tags:
-            lower_name = tag.name.lower()
-            if lower_name in tag_dict:
-                existing_tag = tag_dict[lower_name]
-                self._deduplicate_tags(existing_tag=existing_tag, tag_to_remove=tag)
-            else:
-                tag_dict[lower_name] = tag
+        duplicate_ids = list(targets)
+        for start in range(0, len(duplicate_ids), chunk_size):
+            end = start + chunk_size
+            chunk = {pk: targets[pk] for pk in duplicate_ids[start:end]}
+            with transaction.atomic(using=using):
+                _merge_tags(Tag, chunk, using)
+            self.stdout.write(
+                f"Merged {start + len(chunk)}/{len(duplicate_ids)} duplicate tags."
+            )
 
         self.stdout.write(self.style.SUCCESS("Tag deduplication complete."))
 
-    @transaction.atomic
-    def _deduplicate_tags(self, existing_tag, tag_to_remove):
+    def _find_duplicates(self, using):
         """
-        Remove a tag by merging it into an existing tag
+        Returns a ``{duplicate tag id: tag id}`` dict, grouping the tags by
+        lowercased name in the database so that only the ids of duplicated
+        tags are loaded.
         """
-        # If this ends up very slow for you, please file a ticket!
-        # This isn't trying to be performant, in order to keep the code simple.
-        for item in TaggedItem.objects.filter(tag=tag_to_remove):
-            # if we already have the same association on the model
-            # (via the existing tag), then we can just remove the
-            # tagged item.
-            tag_exists_other = TaggedItem.objects.filter(
-                tag=existing_tag,
-                content_type_id=item.content_type_id,
-                object_id=item.object_id,
-            ).exists()
-            if tag_exists_other:
-                item.delete()
-            else:
-                item.tag = existing_tag
-                item.save()
-
-        # this should never trigger, but can never be too sure
-        assert not TaggedItem.objects.filter(
-            tag=tag_to_remove
-        ).exists(), "Tags were not all cleaned up!"
-
-        tag_to_remove.delete()
-
-    def _collect_tagged_items(self, tag, existing_tag, tagged_items_to_update):
-        for item in TaggedItem.objects.filter(tag=tag):
-            tagged_items_to_update[(item.content_type_id, item.object_id)].append(
-                existing_tag.id
-            )
-
-    def _remove_duplicates_and_update(self, tagged_items_to_update):
-        with transaction.atomic():
-            for (content_type_id, object_id), tag_ids in tagged_items_to_update.items():
-                unique_tag_ids = set(tag_ids)
-                if len(unique_tag_ids) > 1:
-                    first_tag_id = unique_tag_ids.pop()
-                    for duplicate_tag_id in unique_tag_ids:
-                        TaggedItem.objects.filter(
-                            content_type_id=content_type_id,
-                            object_id=object_id,
-                            tag_id=duplicate_tag_id,
-                        ).delete()
-
-                    TaggedItem.objects.filter(
-                        content_type_id=content_type_id,
-                        object_id=object_id,
-                        tag_id=first_tag_id,
-                    ).update(tag_id=first_tag_id)
+        tags = Tag.objects.using(using).annotate(lower_name=Lower("name"))
+        duplicated_names = (
+            tags.values("lower_name")
+            .annotate(num_tags=models.Count("pk"))
+            .filter(num_tags__gt=1)
+            .values("lower_name")
+        )
+        rows = (
+            tags.filter(lower_name__in=duplicated_names)
+            .order_by("lower_name", "pk")
+            .values_list("lower_name", "pk")
+        )
+        targets = {}
+        for _lower_name, group in groupby(rows.iterator(), key=lambda row: row[0]):
+            (_lower_name, target_id), *duplicates = group
+            for _lower_name, pk in duplicates:
+                targets[pk] = target_id
+        return targets
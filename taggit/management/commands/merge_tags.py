@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from taggit.models import Tag, merge_tags
+
+
+class Command(BaseCommand):
+    help = "Merge tags into another tag, which is created if needed"
+
+    def add_arguments(self, parser):
+        parser.add_argument("target", help="Name of the tag to merge into.")
+        parser.add_argument("sources", nargs="+", help="Names of the tags to merge.")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Number of tags merged per transaction. Defaults to 500.",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help='Nominates a database to merge the tags in. Defaults to the "default" '
+            "database.",
+        )
+
+    def handle(self, *args, **options):
+        tags = Tag.objects.using(options["database"])
+        sources = tags.filter(name__in=options["sources"])
+        missing = set(options["sources"]) - set(sources.values_list("name", flat=True))
+        if missing:
+            raise CommandError("Unknown tags: %s." % ", ".join(sorted(missing)))
+
+        target, _created = tags.get_or_create(name=options["target"])
+        count = merge_tags(sources, target, chunk_size=max(options["chunk_size"], 1))
+        self.stdout.write(
+            self.style.SUCCESS(f"Merged {count} tags into {target.name!r}.")
+        )
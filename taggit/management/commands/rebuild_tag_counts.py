@@ -0,0 +1,27 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from taggit.models import CounterBase
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the tag counts and co-occurrences (used by most_common() and "
+        "related_tags()) from the tagged items"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help='Nominates a database to rebuild. Defaults to the "default" database.',
+        )
+
+    def handle(self, *args, **options):
+        for model in apps.get_models():
+            if issubclass(model, CounterBase) and not model._meta.proxy:
+                model.rebuild(using=options["database"])
+                self.stdout.write(
+                    self.style.SUCCESS(f"Rebuilt the counts of {model._meta.label}.")
+                )
@@ -1,4 +1,7 @@
+import time
+
 from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
 
 from taggit.models import Tag
 
@@ -6,7 +9,56 @@ from taggit.models import Tag
 class Command(BaseCommand):
     help = "Remove orphaned tags"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of tags deleted per transaction. Defaults to 1000.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="Seconds to wait between batches, to let other writes through.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Count the orphaned tags without removing them.",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help='Nominates a database to clean up. Defaults to the "default" '
+            "database.",
+        )
+
     def handle(self, *args, **options):
-        orphaned_tags = Tag.objects.orphaned()
-        count = orphaned_tags.delete()
+        using = options["database"]
+        tags = Tag.objects.using(using)
+        if options["dry_run"]:
+            count = tags.orphaned().count()
+            self.stdout.write(f"Would remove {count} orphaned tags")
+            return
+
+        batch_size = max(options["batch_size"], 1)
+        count = 0
+        last_pk = None
+        while True:
+            orphaned_tags = tags.orphaned().order_by("pk")
+            if last_pk is not None:
+                orphaned_tags = orphaned_tags.filter(pk__gt=last_pk)
+            batch = list(orphaned_tags.values_list("pk", flat=True)[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1]
+            with transaction.atomic(using=using):
+                # check again, the tags may have been used in the meantime
+                _deleted, rows = tags.filter(pk__in=batch).orphaned().delete()
+            count += rows.get(Tag._meta.label, 0)
+            self.stdout.write(f"Removed {count} orphaned tags so far")
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
         self.stdout.write(f"Successfully removed {count} orphaned tags")
@@ -1,11 +1,11 @@
 import uuid
+from itertools import islice
 from operator import attrgetter
 
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericRelation
 from django.contrib.contenttypes.models import ContentType
-from django.core.exceptions import MultipleObjectsReturned
-from django.db import models, router
+from django.db import connections, models, router
 from django.db.models import signals
 from django.db.models.fields.related import (
     ManyToManyRel,
@@ -13,16 +13,23 @@ from django.db.models.fields.related import (
     RelatedField,
     lazy_related_operation,
 )
+from django.db.models.functions import Cast, Lower, Sqrt
 from django.db.models.query_utils import PathInfo
+from django.db.models.utils import resolve_callables
 from django.utils.functional import cached_property
 from django.utils.text import capfirst
 from django.utils.translation import gettext_lazy as _
 
+from taggit import cache as tag_cache
 from taggit.forms import TagField
 from taggit.models import (
     CommonGenericTaggedItemBase,
     GenericUUIDTaggedItemBase,
+    TagBase,
+    TagCooccurrenceBase,
+    TagCountBase,
     TaggedItem,
+    content_type_subquery,
 )
 from taggit.utils import require_instance_manager
 
@@ -99,13 +106,12 @@ class _TaggableManager(models.Manager):
             return self.get_prefetch_querysets(instances, [queryset])
 
     def get_prefetch_querysets(self, instances, querysets=None):
-        if querysets is not None:
-            # this queryset is meant to be used for filtering down the prefetch
-            # this work has not been done yet.
-            #
-            # Some hint from Django: asserting that len(querysets) == 1 if it's not None
-            # and then using that to filter down the qs
-            raise ValueError("Custom querysets can't be used for this lookup.")
+        if querysets and len(querysets) != 1:
+            raise ValueError(
+                "querysets argument of get_prefetch_querysets() should have a "
+                "length of 1."
+            )
+        queryset = querysets[0] if querysets else None
 
         instance = instances[0]
         db = self._db or router.db_for_read(type(instance), instance=instance)
@@ -123,13 +129,17 @@ class _TaggableManager(models.Manager):
             }
         }
         source_col = fk.name
-        qs = (
-            self.get_queryset(query)
-            .using(db)
-            .annotate(
-                _prefetch_related_val=models.F(
-                    f"{self.through.tag_relname()}__{source_col}"
-                )
+        if queryset is None:
+            qs = self.get_queryset(query)
+        else:
+            # apply our filters to the given queryset (for a Prefetch object),
+            # keeping its own ordering if it has any
+            qs = self.through.tags_for(self.model, queryset=queryset, **query)
+            if not qs.query.order_by:
+                qs = qs.order_by(*self.ordering)
+        qs = qs.using(db).annotate(
+            _prefetch_related_val=models.F(
+                f"{self.through.tag_relname()}__{source_col}"
             )
         )
 
@@ -155,11 +165,19 @@ class _TaggableManager(models.Manager):
             False,
         )
 
+    def _apply_rel_filters(self, queryset):
+        """
+        Filters the queryset of a ``Prefetch`` object down to this instance.
+        """
+        return self.through.tags_for(self.model, self.instance, queryset=queryset)
+
     def _lookup_kwargs(self):
         return self.through.lookup_kwargs(self.instance)
 
-    def _remove_prefetched_objects(self):
-        prefetch_cache = getattr(self.instance, "_prefetched_objects_cache", None)
+    def _remove_prefetched_objects(self, instance=None):
+        if instance is None:
+            instance = self.instance
+        prefetch_cache = getattr(instance, "_prefetched_objects_cache", None)
         if prefetch_cache:
             prefetch_cache.pop(self.prefetch_cache_name, None)
 
@@ -181,7 +199,8 @@ class _TaggableManager(models.Manager):
             .filter(**self._lookup_kwargs())
         )
 
-        new_ids = new_ids - set(vals)
+        existing_ids = set(vals)
+        new_ids = new_ids - existing_ids
 
         signals.m2m_changed.send(
             sender=self.through,
@@ -193,10 +212,14 @@ class _TaggableManager(models.Manager):
             using=db,
         )
 
-        for tag in tag_objs:
-            self.through._default_manager.using(db).get_or_create(
-                tag=tag, **self._lookup_kwargs(), defaults=through_defaults
-            )
+        self._add_through_rows(
+            db,
+            [(self.instance, [tag for tag in tag_objs if tag.pk in new_ids])],
+            through_defaults,
+        )
+        self._update_tag_counters(
+            db, [(self.instance, new_ids, existing_ids | new_ids)], 1
+        )
 
         signals.m2m_changed.send(
             sender=self.through,
@@ -208,50 +231,57 @@ class _TaggableManager(models.Manager):
             using=db,
         )
 
-    def _to_tag_model_instances(self, tags, tag_kwargs):
+    def _add_through_rows(self, db, instance_tags, through_defaults=None):
         """
-        Takes an iterable containing either strings, tag objects, or a mixture
-        of both and returns a list of tag objects while preserving order.
+        Creates the through model rows linking each instance of the
+        ``(instance, tags)`` pairs in ``instance_tags`` to its tags.
+
+        The rows are written with a single ``bulk_create`` when possible.
+        Through models that customize ``save()`` or have ``pre_save`` or
+        ``post_save`` receivers get one ``get_or_create`` per tag instead, so
+        that their ``save()`` keeps being called and the signals sent.
         """
-        db = router.db_for_write(self.through, instance=self.instance)
+        manager = self.through._default_manager.using(db)
+        sends_signals = any(
+            signal.has_listeners(self.through)
+            for signal in (signals.pre_save, signals.post_save)
+        )
+        if not sends_signals and _can_bulk_insert(self.through, db, models.Model.save):
+            defaults = dict(resolve_callables(through_defaults or {}))
+            manager.bulk_create(
+                [
+                    self.through(
+                        tag=tag, **self.through.lookup_kwargs(instance), **defaults
+                    )
+                    for instance, tags in instance_tags
+                    for tag in tags
+                ],
+                ignore_conflicts=True,
+            )
+        else:
+            for instance, tags in instance_tags:
+                lookup_kwargs = self.through.lookup_kwargs(instance)
+                for tag in tags:
+                    manager.get_or_create(
+                        tag=tag, **lookup_kwargs, defaults=through_defaults
+                    )
 
-        case_insensitive = getattr(settings, "TAGGIT_CASE_INSENSITIVE", False)
-        manager = self.through.tag_model()._default_manager.using(db)
+    def _to_tag_model_instances(self, tags, tag_kwargs, existing_tags_for_str=None):
+        """
+        Takes an iterable containing either strings, tag objects, or a mixture
+        of both and returns a list of tag objects while preserving order.
 
+        ``existing_tags_for_str`` can be given to reuse a mapping of tag names
+        to tags built by ``_tags_for_strs``, in which case no queries are made.
+        """
         # tags can be instances of our through models, or strings
-
-        tag_strs = [tag for tag in tags if isinstance(tag, str)]
-        # This map from tag names to tags lets us handle deduplication
-        # without doing extra queries along the way, all while relying on
-        # data we were going to pull out of the database anyways
-        # existing_tags_for_str[tag_name] = tag
-        existing_tags_for_str = {}
-        # we are going to first try and lookup existing tags (in a single query)
-        if case_insensitive:
-            # Some databases can do case-insensitive comparison with IN, which
-            # would be faster, but we can't rely on it or easily detect it
-            existing = []
-            tags_to_create = []
-            for name in tag_strs:
-                try:
-                    tag = manager.get(name__iexact=name, **tag_kwargs)
-                    existing_tags_for_str[name] = tag
-                except self.through.tag_model().DoesNotExist:
-                    tags_to_create.append(name)
-                except MultipleObjectsReturned:
-                    tag = (
-                        manager.filter(name__iexact=name, **tag_kwargs)
-                        .order_by("pk")
-                        .first()
-                    )
-                    existing_tags_for_str[name] = tag
-        else:
-            # Django is smart enough to not actually query if tag_strs is empty
-            # but importantly, this is a single query for all potential tags
-            existing = manager.filter(name__in=tag_strs, **tag_kwargs)
-            # we're going to end up doing this query anyways, so here is fine
-            for t in existing:
-                existing_tags_for_str[t.name] = t
+        if existing_tags_for_str is None:
+            db = router.db_for_write(self.through, instance=self.instance)
+            existing_tags_for_str = self._tags_for_strs(
+                self.through.tag_model()._default_manager.using(db),
+                [tag for tag in tags if isinstance(tag, str)],
+                tag_kwargs,
+            )
 
         result = []
         # this set is used for deduplicating tags
@@ -262,22 +292,7 @@ class _TaggableManager(models.Manager):
                     seen_tags.add(t)
                     result.append(t)
             elif isinstance(t, str):
-                # we are using a string, so either the tag exists (and we have the lookup)
-                # or we need to create the value
-
-                existing_tag = existing_tags_for_str.get(t, None)
-                if existing_tag is None:
-                    # we need to create a tag
-                    # (we use get_or_create to handle potential races)
-                    if case_insensitive:
-                        lookup = {"name__iexact": t, **tag_kwargs}
-                    else:
-                        lookup = {"name": t, **tag_kwargs}
-                    existing_tag, _ = manager.get_or_create(
-                        **lookup, defaults={"name": t}
-                    )
-                # we now have an existing tag for this string
-
+                existing_tag = existing_tags_for_str[t]
                 # confirm if we've seen it or not (this is where case insensitivity comes
                 # into play)
                 if existing_tag not in seen_tags:
@@ -292,6 +307,148 @@ class _TaggableManager(models.Manager):
 
         return result
 
+    def _tags_for_strs(self, manager, tag_strs, tag_kwargs):
+        """
+        Returns a dict mapping each of the given tag names to its tag,
+        creating the tags that don't exist yet.
+        """
+        # This map from tag names to tags lets us handle deduplication
+        # without doing extra queries along the way, all while relying on
+        # data we were going to pull out of the database anyways
+        # existing_tags_for_str[tag_name] = tag
+        #
+        # Django is smart enough to not actually query if tag_strs is empty
+        # but importantly, this is a single query for all potential tags
+        existing_tags_for_str = self._lookup_tags(manager, tag_strs, tag_kwargs)
+
+        # create every tag that is still missing up front, so that callers
+        # only have to deal with tags we already know about
+        missing_tag_strs = [t for t in tag_strs if t not in existing_tags_for_str]
+        if missing_tag_strs:
+            existing_tags_for_str.update(
+                self._create_tags(manager, missing_tag_strs, tag_kwargs)
+            )
+        return existing_tags_for_str
+
+    def _lookup_tags(self, manager, tag_strs, tag_kwargs):
+        """
+        Fetches the existing tags for the given names and returns a dict
+        mapping each name that was found to its tag.
+
+        Names are first looked up in the tag cache (see ``taggit.cache``),
+        the remaining ones are fetched with a single query.
+        """
+        case_insensitive = getattr(settings, "TAGGIT_CASE_INSENSITIVE", False)
+        if case_insensitive:
+            field, cache_key = "name_lower", str.lower
+        else:
+            field, cache_key = "name", str
+
+        tag_model = manager.model
+        cached = tag_cache.get_tags(
+            tag_model, manager.db, field, {cache_key(t) for t in tag_strs}, tag_kwargs
+        )
+        tags_for_str = {}
+        missing_tag_strs = []
+        for name in tag_strs:
+            if cache_key(name) in cached:
+                tags_for_str[name] = cached[cache_key(name)]
+            else:
+                missing_tag_strs.append(name)
+
+        if missing_tag_strs:
+            fetched = self._query_tags(manager, missing_tag_strs, tag_kwargs)
+            tags_for_str.update(fetched)
+            tag_cache.cache_tags(
+                tag_model,
+                manager.db,
+                field,
+                {cache_key(name): tag for name, tag in fetched.items()},
+                tag_kwargs,
+            )
+        return tags_for_str
+
+    def _query_tags(self, manager, tag_strs, tag_kwargs):
+        """
+        Fetches the existing tags for the given names in a single query and
+        returns a dict mapping each name that was found to its tag.
+
+        With ``TAGGIT_CASE_INSENSITIVE`` names are compared on their lowercased
+        form, and when several tags match the same name the earliest by PK
+        wins.
+        """
+        if not getattr(settings, "TAGGIT_CASE_INSENSITIVE", False):
+            return {
+                tag.name: tag for tag in manager.filter(name__in=tag_strs, **tag_kwargs)
+            }
+
+        tag_strs_for_lower = {}
+        for name in tag_strs:
+            tag_strs_for_lower.setdefault(name.lower(), []).append(name)
+
+        existing = (
+            manager.annotate(_taggit_name_lower=Lower("name"))
+            .filter(_taggit_name_lower__in=tag_strs_for_lower, **tag_kwargs)
+            .order_by("pk")
+        )
+        tags_for_str = {}
+        for tag in existing:
+            # key on the database's idea of the lowercased name, since that
+            # is what the filter above matched on
+            for name in tag_strs_for_lower.get(tag._taggit_name_lower, ()):
+                tags_for_str.setdefault(name, tag)
+        return tags_for_str
+
+    def _create_tags(self, manager, tag_strs, tag_kwargs):
+        """
+        Creates tags for the given names (which are expected to be missing)
+        and returns a dict mapping each name to its tag.
+
+        Where the backend and tag model allow it, all of the tags are inserted
+        with a single ``bulk_create`` and then selected back. Anything that
+        could not be inserted that way (typically because its slug is already
+        taken) goes through ``get_or_create``, which lets ``TagBase.save``
+        find a free slug and handles races with other writers.
+        """
+        case_insensitive = getattr(settings, "TAGGIT_CASE_INSENSITIVE", False)
+        tag_model = manager.model
+        created = {}
+
+        if _can_bulk_insert(tag_model, manager.db, TagBase.save):
+            # mirror what get_or_create would use to build the instance
+            create_kwargs = {k: v for k, v in tag_kwargs.items() if "__" not in k}
+            new_tags = {}
+            seen_slugs = set()
+            for name in tag_strs:
+                key = name.lower() if case_insensitive else name
+                if key in new_tags:
+                    continue
+                tag = tag_model(name=name, **create_kwargs)
+                tag.slug = tag.slugify(name)
+                # two names with the same slug can't be inserted together,
+                # leave the later ones to the slow path
+                if tag.slug in seen_slugs:
+                    continue
+                seen_slugs.add(tag.slug)
+                new_tags[key] = tag
+
+            # conflicting rows (an existing slug, or a tag created
+            # concurrently) are silently skipped here and picked up below
+            manager.bulk_create(new_tags.values(), ignore_conflicts=True)
+            created = self._lookup_tags(manager, tag_strs, tag_kwargs)
+
+        for name in tag_strs:
+            if name in created:
+                continue
+            # (we use get_or_create to handle potential races)
+            if case_insensitive:
+                lookup = {"name__iexact": name, **tag_kwargs}
+            else:
+                lookup = {"name": name, **tag_kwargs}
+            created[name], _ = manager.get_or_create(**lookup, defaults={"name": name})
+
+        return created
+
     @require_instance_manager
     def names(self):
         return self.get_queryset().values_list("name", flat=True)
@@ -311,8 +468,6 @@ class _TaggableManager(models.Manager):
         Any kwarg apart from 'clear' will be passed when adding tags.
 
         """
-        db = router.db_for_write(self.through, instance=self.instance)
-
         clear = kwargs.pop("clear", False)
         tag_kwargs = kwargs.pop("tag_kwargs", {})
 
@@ -320,26 +475,17 @@ class _TaggableManager(models.Manager):
             self.clear()
             self.add(*tags, **kwargs)
         else:
-            # make sure we're working with a collection of a uniform type
-            objs = self._to_tag_model_instances(tags, tag_kwargs)
-
-            # get the existing tag strings
-            old_tag_strs = set(
-                self.through._default_manager.using(db)
-                .filter(**self._lookup_kwargs())
-                .values_list("tag__name", flat=True)
+            # diff the wanted tags against the existing rows by tag pk, which
+            # takes one read, one delete and one insert however many tags
+            # are involved
+            self._bulk_change_tags_chunk(
+                [(self.instance, tags)],
+                replace=True,
+                through_defaults=through_defaults,
+                tag_kwargs=tag_kwargs,
+                send_signals=True,
             )
 
-            new_objs = []
-            for obj in objs:
-                if obj.name in old_tag_strs:
-                    old_tag_strs.remove(obj.name)
-                else:
-                    new_objs.append(obj)
-
-            self.remove(*old_tag_strs)
-            self.add(*new_objs, through_defaults=through_defaults, **kwargs)
-
     @require_instance_manager
     def remove(self, *tags):
         if not tags:
@@ -355,6 +501,13 @@ class _TaggableManager(models.Manager):
         )
 
         old_ids = set(qs.values_list("tag_id", flat=True))
+        tag_ids = None
+        if self._tag_cooccurrence_model() is not None:
+            tag_ids = set(
+                self.through._default_manager.using(db)
+                .filter(**self._lookup_kwargs())
+                .values_list("tag_id", flat=True)
+            )
 
         signals.m2m_changed.send(
             sender=self.through,
@@ -366,6 +519,7 @@ class _TaggableManager(models.Manager):
             using=db,
         )
         qs.delete()
+        self._update_tag_counters(db, [(self.instance, old_ids, tag_ids)], -1)
         signals.m2m_changed.send(
             sender=self.through,
             action="post_remove",
@@ -391,7 +545,13 @@ class _TaggableManager(models.Manager):
             using=db,
         )
 
-        self.through._default_manager.using(db).filter(**self._lookup_kwargs()).delete()
+        qs = self.through._default_manager.using(db).filter(**self._lookup_kwargs())
+        if self._tag_count_model() or self._tag_cooccurrence_model():
+            old_ids = set(qs.values_list("tag_id", flat=True))
+            qs.delete()
+            self._update_tag_counters(db, [(self.instance, old_ids, old_ids)], -1)
+        else:
+            qs.delete()
 
         signals.m2m_changed.send(
             sender=self.through,
@@ -403,7 +563,259 @@ class _TaggableManager(models.Manager):
             using=db,
         )
 
+    def bulk_add(
+        self,
+        instance_tags,
+        *,
+        through_defaults=None,
+        tag_kwargs=None,
+        batch_size=1000,
+        send_signals=True,
+    ):
+        """
+        Adds tags to many objects at once.
+
+        ``instance_tags`` is an iterable of ``(instance, tags)`` pairs, where
+        ``tags`` is what you would pass to ``add()``. The pairs are handled in
+        chunks of ``batch_size`` objects, and each chunk takes a fixed number
+        of queries however many objects and tags it contains. Like ``add()``,
+        it raises ``ValueError`` for objects that aren't saved yet, before
+        touching the chunk that contains them.
+        """
+        self._bulk_change_tags(
+            instance_tags,
+            replace=False,
+            through_defaults=through_defaults,
+            tag_kwargs=tag_kwargs or {},
+            batch_size=batch_size,
+            send_signals=send_signals,
+        )
+
+    def bulk_set(
+        self,
+        instance_tags,
+        *,
+        through_defaults=None,
+        tag_kwargs=None,
+        batch_size=1000,
+        send_signals=True,
+    ):
+        """
+        Sets the tags of many objects at once.
+
+        This is the ``set()`` counterpart of ``bulk_add()``: tags that aren't
+        listed for an object are removed from it.
+        """
+        self._bulk_change_tags(
+            instance_tags,
+            replace=True,
+            through_defaults=through_defaults,
+            tag_kwargs=tag_kwargs or {},
+            batch_size=batch_size,
+            send_signals=send_signals,
+        )
+
+    def _bulk_change_tags(self, instance_tags, batch_size, **kwargs):
+        instance_tags = iter(instance_tags)
+        while True:
+            chunk = list(islice(instance_tags, batch_size))
+            if not chunk:
+                break
+            self._bulk_change_tags_chunk(chunk, **kwargs)
+
+    def _bulk_change_tags_chunk(
+        self, chunk, replace, through_defaults, tag_kwargs, send_signals
+    ):
+        for instance, _tags in chunk:
+            # as TaggableManager.__get__() does for add() and set()
+            if instance.pk is None:
+                raise ValueError(
+                    "%s objects need to have a primary key value "
+                    "before you can access their tags." % type(instance).__name__
+                )
+        # merge the pairs for the same object, and materialize the tags as
+        # we need to go over them twice
+        tags_for_key = {}
+        for instance, tags in chunk:
+            key = self._object_key(instance)
+            tags_for_key.setdefault(key, (instance, []))[1].extend(tags)
+        instance_tags = list(tags_for_key.values())
+
+        db = router.db_for_write(self.through, instance=instance_tags[0][0])
+        tag_model = self.through.tag_model()
+        manager = self.through._default_manager.using(db)
+
+        existing_tags_for_str = self._tags_for_strs(
+            tag_model._default_manager.using(db),
+            [t for _, tags in instance_tags for t in tags if isinstance(t, str)],
+            tag_kwargs,
+        )
+
+        # existing_rows[object key] = {tag_id: through pk}
+        existing_rows = {}
+        rows = self._through_rows_for(
+            manager, [instance for instance, _ in instance_tags]
+        ).values_list("pk", "tag_id", *self._object_key_fields())
+        for pk, tag_id, *key in rows:
+            existing_rows.setdefault(tuple(key), {})[tag_id] = pk
+
+        added = []
+        removed = []
+        for key, (instance, tags) in tags_for_key.items():
+            self._remove_prefetched_objects(instance)
+            tag_objs = self._to_tag_model_instances(
+                tags, tag_kwargs, existing_tags_for_str
+            )
+            current = existing_rows.get(key, {})
+            new_tags = [tag for tag in tag_objs if tag.pk not in current]
+            tag_ids = set(current) | {tag.pk for tag in new_tags}
+            if replace:
+                keep_ids = {tag.pk for tag in tag_objs}
+                old_ids = {tag_id for tag_id in current if tag_id not in keep_ids}
+                if old_ids:
+                    removed.append(
+                        (instance, old_ids, [current[i] for i in old_ids], set(current))
+                    )
+                    tag_ids -= old_ids
+            added.append((instance, new_tags, tag_ids))
+
+        if removed:
+            pk_sets = [(i, old_ids) for i, old_ids, _, _ in removed]
+            self._send_m2m_changed("pre_remove", pk_sets, db, send_signals)
+            manager.filter(
+                pk__in=[pk for _, _, pks, _ in removed for pk in pks]
+            ).delete()
+            self._update_tag_counters(
+                db, [(i, old_ids, tag_ids) for i, old_ids, _, tag_ids in removed], -1
+            )
+            self._send_m2m_changed("post_remove", pk_sets, db, send_signals)
+
+        pk_sets = [(instance, {tag.pk for tag in tags}) for instance, tags, _ in added]
+        self._send_m2m_changed("pre_add", pk_sets, db, send_signals)
+        self._add_through_rows(
+            db, [(instance, tags) for instance, tags, _ in added], through_defaults
+        )
+        self._update_tag_counters(
+            db,
+            [
+                (i, pk_set, tag_ids)
+                for (i, pk_set), (_, _, tag_ids) in zip(pk_sets, added)
+            ],
+            1,
+        )
+        self._send_m2m_changed("post_add", pk_sets, db, send_signals)
+
+    def _send_m2m_changed(self, action, pk_sets, using, send_signals=True):
+        if not send_signals:
+            return
+        for instance, pk_set in pk_sets:
+            signals.m2m_changed.send(
+                sender=self.through,
+                action=action,
+                instance=instance,
+                reverse=False,
+                model=self.through.tag_model(),
+                pk_set=pk_set,
+                using=using,
+            )
+
+    def _object_key_fields(self):
+        """
+        The through model fields identifying the tagged object of a row.
+        """
+        if issubclass(self.through, CommonGenericTaggedItemBase):
+            return ("content_type_id", "object_id")
+        return (self.through._meta.get_field("content_object").attname,)
+
+    def _object_key(self, instance):
+        """
+        The values of ``_object_key_fields`` for rows tagging ``instance``.
+        """
+        if issubclass(self.through, CommonGenericTaggedItemBase):
+            object_id = self.through._meta.get_field("object_id").to_python(instance.pk)
+            return (ContentType.objects.get_for_model(instance).pk, object_id)
+        fk = self.through._meta.get_field("content_object")
+        return (getattr(instance, fk.target_field.attname),)
+
+    def _through_rows_for(self, manager, instances):
+        """
+        Filters ``manager`` down to the through rows of all of ``instances``.
+        """
+        keys = {self._object_key(instance) for instance in instances}
+        if not issubclass(self.through, CommonGenericTaggedItemBase):
+            return manager.filter(
+                **{"%s__in" % self._object_key_fields()[0]: [k[0] for k in keys]}
+            )
+        object_ids_for_ct = {}
+        for content_type_id, object_id in keys:
+            object_ids_for_ct.setdefault(content_type_id, []).append(object_id)
+        q = models.Q()
+        for content_type_id, object_ids in object_ids_for_ct.items():
+            q |= models.Q(content_type_id=content_type_id, object_id__in=object_ids)
+        return manager.filter(q)
+
+    def _tag_count_model(self):
+        """
+        The model counting the uses of our tags, when counts are tracked.
+        """
+        if not getattr(settings, "TAGGIT_TRACK_TAG_COUNTS", False):
+            return None
+        return TagCountBase.for_tag_model(self.through.tag_model())
+
+    def _counted_model(self, instance=None):
+        """
+        The model the uses of our tags by ``instance`` (or by the manager's
+        model) are counted under.
+        """
+        if issubclass(self.through, CommonGenericTaggedItemBase):
+            return self.model if instance is None else type(instance)
+        return self.through._meta.get_field("content_object").related_model
+
+    def _counted_content_type(self, instance=None):
+        return ContentType.objects.get_for_model(self._counted_model(instance))
+
+    def _tag_cooccurrence_model(self):
+        """
+        The model counting which of our tags are used together, when tracked.
+        """
+        if not getattr(settings, "TAGGIT_TRACK_TAG_COOCCURRENCES", False):
+            return None
+        return TagCooccurrenceBase.for_tag_model(self.through.tag_model())
+
+    def _update_tag_counters(self, db, changes, delta):
+        """
+        Updates the tag counts and co-occurrences for the ``(instance, changed
+        tag pks, tag pks)`` triples in ``changes``, where ``delta`` is 1 when
+        the changed tags were added and -1 when they were removed.
+
+        The tag pks of an instance include the changed ones; they are only
+        needed (and may be ``None`` otherwise) for co-occurrences.
+        """
+        count_model = self._tag_count_model()
+        cooccurrence_model = self._tag_cooccurrence_model()
+        if count_model is None and cooccurrence_model is None:
+            return
+        counts = {}
+        cooccurrences = {}
+        for instance, changed_ids, tag_ids in changes:
+            content_type_id = self._counted_content_type(instance).pk
+            for pk in changed_ids:
+                key = (content_type_id, pk)
+                counts[key] = counts.get(key, 0) + delta
+            if cooccurrence_model is not None:
+                for pair in cooccurrence_model.pairs(tag_ids, changed_ids):
+                    key = (content_type_id, *pair)
+                    cooccurrences[key] = cooccurrences.get(key, 0) + delta
+        if count_model is not None:
+            count_model.update_counts(self.through, counts, db)
+        if cooccurrence_model is not None:
+            cooccurrence_model.update_counts(self.through, cooccurrences, db)
+
     def most_common(self, min_count=None, extra_filters=None):
+        count_model = self._tag_count_model()
+        if count_model is not None and self.instance is None and not extra_filters:
+            return self._most_common_from_counts(count_model, min_count)
+
         queryset = (
             self.get_queryset(extra_filters)
             .annotate(num_times=models.Count(self.through.tag_relname()))
@@ -414,28 +826,104 @@ class _TaggableManager(models.Manager):
 
         return queryset
 
+    def _most_common_from_counts(self, count_model, min_count):
+        counts = count_model._meta.get_field("tag").related_query_name()
+        queryset = (
+            self.through.tag_model()
+            .objects.filter(
+                **{
+                    # lazy, like the other model level querysets
+                    "%s__through" % counts: content_type_subquery(self.through),
+                    "%s__content_type"
+                    % counts: content_type_subquery(self._counted_model()),
+                    "%s__count__gte" % counts: max(min_count or 1, 1),
+                }
+            )
+            .annotate(num_times=models.F("%s__count" % counts))
+            .order_by("-num_times")
+        )
+        return queryset
+
     @require_instance_manager
-    def similar_objects(self):
+    def similar_objects(
+        self, limit=None, min_shared=None, content_types=None, method="count"
+    ):
+        """
+        Returns the other objects sharing tags with this one, the most similar
+        first, decorated with the number of shared tags as ``similar_tags``
+        and their similarity score as ``similarity``.
+
+        ``method`` is how the similarity is scored: ``"count"`` (the number
+        of shared tags), ``"jaccard"`` (shared tags over the tags of either
+        object) or ``"cosine"`` (shared tags over the geometric mean of the
+        number of tags of each object).
+
+        The ranking is done by the database, which only returns the ``limit``
+        best matches sharing at least ``min_shared`` tags. With a generic
+        through model, ``content_types`` (models or ``ContentType`` instances)
+        restricts the objects to those types.
+        """
+        if method not in ("count", "jaccard", "cosine"):
+            raise ValueError(
+                "Unknown similarity method %r, expected 'count', 'jaccard' or "
+                "'cosine'." % method
+            )
         lookup_kwargs = self._lookup_kwargs()
         lookup_keys = sorted(lookup_kwargs)
         qs = self.through.objects.values(*lookup_kwargs.keys())
         qs = qs.annotate(n=models.Count("pk"))
         qs = qs.exclude(**lookup_kwargs)
-        qs = qs.filter(tag__in=self.all())
-        qs = qs.order_by("-n")
+        # compare tag ids with a subquery on our own rows, no need to join
+        # the tag table
+        qs = qs.filter(
+            tag__in=self.through.objects.filter(**lookup_kwargs).values("tag_id")
+        )
+        if content_types is not None:
+            if len(lookup_keys) == 1:
+                raise ValueError(
+                    "content_types can only be used with a generic through model."
+                )
+            qs = qs.filter(
+                content_type__in=[
+                    (
+                        ct
+                        if isinstance(ct, ContentType)
+                        else ContentType.objects.get_for_model(ct)
+                    )
+                    for ct in content_types
+                ]
+            )
+        if min_shared:
+            qs = qs.filter(n__gte=min_shared)
+
+        if method == "count":
+            qs = qs.annotate(similarity=models.F("n"))
+        else:
+            # the number of tags of this object, and of each candidate
+            own_total = self._tag_total_subquery(lookup_kwargs)
+            total = self._tag_total_subquery(
+                {key: models.OuterRef(key) for key in lookup_keys}
+            )
+            shared = Cast("n", models.FloatField())
+            if method == "jaccard":
+                qs = qs.annotate(similarity=shared / (own_total + total - shared))
+            else:
+                qs = qs.annotate(similarity=shared / Sqrt(own_total * total))
+        # order ties on the object, so that the slice is stable
+        qs = qs.order_by("-similarity", "-n", *lookup_keys)
+        if limit is not None:
+            qs = qs[:limit]
+        rows = list(qs)
 
-        # TODO: This all feels like a bit of a hack.
         items = {}
         if len(lookup_keys) == 1:
-            # Can we do this without a second query by using a select_related()
-            # somehow?
             f = self.through._meta.get_field(lookup_keys[0])
             remote_field = f.remote_field
             rel_model = remote_field.model
             objs = rel_model._default_manager.filter(
                 **{
                     "%s__in"
-                    % remote_field.field_name: [r["content_object"] for r in qs]
+                    % remote_field.field_name: [r["content_object"] for r in rows]
                 }
             )
             actual_remote_field_name = f.target_field.get_attname()
@@ -443,22 +931,42 @@ class _TaggableManager(models.Manager):
                 items[(getattr(obj, actual_remote_field_name),)] = obj
         else:
             preload = {}
-            for result in qs:
+            for result in rows:
                 preload.setdefault(result["content_type"], set())
                 preload[result["content_type"]].add(result["object_id"])
 
+            # one query per content type, as they live in different tables
             for ct, obj_ids in preload.items():
                 ct = ContentType.objects.get_for_id(ct)
                 for obj in ct.model_class()._default_manager.filter(pk__in=obj_ids):
                     items[(ct.pk, obj.pk)] = obj
 
         results = []
-        for result in qs:
-            obj = items[tuple(result[k] for k in lookup_keys)]
+        for result in rows:
+            # the rows of deleted objects are skipped
+            obj = items.get(tuple(result[k] for k in lookup_keys))
+            if obj is None:
+                continue
             obj.similar_tags = result["n"]
+            obj.similarity = result["similarity"]
             results.append(obj)
         return results
 
+    def _tag_total_subquery(self, lookup_kwargs):
+        """
+        A subquery counting the tags of the object matched by
+        ``lookup_kwargs`` (which may hold ``OuterRef`` values).
+        """
+        key = sorted(lookup_kwargs)[0]
+        return models.Subquery(
+            self.through.objects.filter(**lookup_kwargs)
+            .order_by()
+            .values(key)
+            .annotate(total=models.Count("pk"))
+            .values("total"),
+            output_field=models.FloatField(),
+        )
+
 
 class TaggableManager(RelatedField):
     # Field flags
@@ -609,6 +1117,8 @@ class TaggableManager(RelatedField):
     def value_from_object(self, obj):
         if obj.pk is None:
             return []
+        if self.name in getattr(obj, "_prefetched_objects_cache", {}):
+            return list(getattr(obj, self.name).all())
         qs = self.through.objects.select_related("tag").filter(
             **self.through.lookup_kwargs(obj)
         )
@@ -792,6 +1302,167 @@ class TaggableManager(RelatedField):
         return [self.related_fields[0][1]]
 
 
+class TaggableQuerySet(models.QuerySet):
+    """
+    A queryset for models with a ``TaggableManager``, adding filters on
+    several tags at once::
+
+        class Food(models.Model):
+            tags = TaggableManager()
+
+            objects = TaggableQuerySet.as_manager()
+
+    The tags (names or tag instances) are resolved to ids first, and each
+    filter is then a single subquery on the through table. ``tags_field``
+    names the ``TaggableManager`` to use when the model has several.
+    """
+
+    def tagged_with_all(self, tags, tags_field=None):
+        """
+        Objects tagged with every one of ``tags``.
+        """
+        tag_ids = self._resolve_tag_ids(tags, tags_field)
+        if tag_ids is None:
+            return self.none()
+        if not tag_ids:
+            return self.all()
+        rows, object_field = self._tagged_rows(tag_ids, tags_field)
+        matching = (
+            rows.values(object_field)
+            .annotate(_tag_count=models.Count("tag_id", distinct=True))
+            .filter(_tag_count=len(tag_ids))
+            .values(object_field)
+        )
+        return self.filter(pk__in=matching)
+
+    def tagged_with_any(self, tags, tags_field=None):
+        """
+        Objects tagged with at least one of ``tags``.
+        """
+        tag_ids = self._resolve_tag_ids(tags, tags_field, ignore_missing=True)
+        if not tag_ids:
+            return self.none()
+        rows, object_field = self._tagged_rows(tag_ids, tags_field)
+        return self.filter(pk__in=rows.values(object_field))
+
+    def tagged_without(self, tags, tags_field=None):
+        """
+        Objects tagged with none of ``tags``.
+        """
+        tag_ids = self._resolve_tag_ids(tags, tags_field, ignore_missing=True)
+        if not tag_ids:
+            return self.all()
+        rows, object_field = self._tagged_rows(tag_ids, tags_field)
+        return self.exclude(pk__in=rows.values(object_field))
+
+    def _get_tags_field(self, tags_field):
+        if tags_field is not None:
+            return self.model._meta.get_field(tags_field)
+        fields = [
+            f for f in self.model._meta.get_fields() if isinstance(f, TaggableManager)
+        ]
+        if len(fields) != 1:
+            raise ValueError(
+                "%s has %d TaggableManagers, pass tags_field to pick one."
+                % (self.model.__name__, len(fields))
+            )
+        return fields[0]
+
+    def _resolve_tag_ids(self, tags, tags_field, ignore_missing=False):
+        """
+        Returns the set of ids of ``tags``, or ``None`` if some of them don't
+        exist (unless ``ignore_missing`` is set).
+        """
+        field = self._get_tags_field(tags_field)
+        manager = getattr(self.model, field.name)
+        tag_model = field.through.tag_model()
+        tag_ids = set()
+        names = []
+        for tag in tags:
+            if isinstance(tag, str):
+                names.append(tag)
+            elif isinstance(tag, tag_model):
+                tag_ids.add(tag.pk)
+            else:
+                raise ValueError(
+                    "Cannot filter on {} ({}). Expected {} or str.".format(
+                        tag, type(tag), tag_model
+                    )
+                )
+        if names:
+            found = manager._lookup_tags(
+                tag_model._default_manager.using(self.db), names, {}
+            )
+            if len(found) != len(set(names)) and not ignore_missing:
+                return None
+            tag_ids.update(tag.pk for tag in found.values())
+        return tag_ids
+
+    def _tagged_rows(self, tag_ids, tags_field):
+        """
+        Returns the through rows using ``tag_ids`` for objects of our model,
+        and the through field holding the object's primary key.
+        """
+        through = self._get_tags_field(tags_field).through
+        rows = through._default_manager.using(self.db).filter(tag_id__in=tag_ids)
+        if issubclass(through, CommonGenericTaggedItemBase):
+            content_types = ContentType.objects.get_for_models(
+                *_get_subclasses(self.model)
+            )
+            return (
+                rows.filter(content_type__in=content_types.values()),
+                "object_id",
+            )
+        return rows, through._meta.get_field("content_object").attname
+
+
+def get_tags_fields(model):
+    """
+    Returns the ``TaggableManager`` fields of ``model``.
+    """
+    return [
+        field
+        for field in model._meta.get_fields()
+        if isinstance(field, TaggableManager)
+    ]
+
+
+def update_tag_counters_on_delete(sender, instance, using, **kwargs):
+    """
+    Removes the uses of the tags of ``instance``, which is about to be deleted
+    along with its through model rows, from the tag counts and co-occurrences.
+    """
+    for field in get_tags_fields(sender):
+        manager = getattr(instance, field.name)
+        if not (manager._tag_count_model() or manager._tag_cooccurrence_model()):
+            continue
+        tag_ids = set(
+            manager.through._default_manager.using(using)
+            .filter(**manager._lookup_kwargs())
+            .values_list("tag_id", flat=True)
+        )
+        manager._update_tag_counters(using, [(instance, tag_ids, tag_ids)], -1)
+
+
+def _can_bulk_insert(model, using, base_save):
+    """
+    Returns whether rows of ``model`` can be written with
+    ``bulk_create(ignore_conflicts=True)`` instead of ``save()``.
+
+    This is only the case when the database supports ignoring conflicts, the
+    model doesn't customize ``base_save`` and it isn't multi-table inherited.
+    """
+    if not connections[using].features.supports_ignore_conflicts:
+        return False
+    if model.save is not base_save:
+        return False
+    opts = model._meta
+    return all(
+        parent._meta.concrete_model is opts.concrete_model
+        for parent in opts.all_parents
+    )
+
+
 def _get_subclasses(model):
     subclasses = [model]
     for field in model._meta.get_fields():
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("taggit", "0007_alter_taggeditem_options"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TagCount",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("count", models.PositiveIntegerField(default=0, verbose_name="count")),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="contenttypes.contenttype",
+                        verbose_name="content type",
+                    ),
+                ),
+                (
+                    "tag",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="counts",
+                        to="taggit.tag",
+                        verbose_name="tag",
+                    ),
+                ),
+                (
+                    "through",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="contenttypes.contenttype",
+                        verbose_name="through model",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "tag count",
+                "verbose_name_plural": "tag counts",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("tag", "through", "content_type"),
+                        name="taggit_tagcount_tag_through_content_type_uniq",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("taggit", "0009_tagcooccurrence"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="taggeditem",
+            index=models.Index(
+                fields=["tag", "content_type", "object_id"],
+                name="taggit_tagg_tag_id_dc04d6_idx",
+            ),
+        ),
+    ]
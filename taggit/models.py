@@ -1,7 +1,12 @@
+from itertools import groupby
+
+from django.apps import apps
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
-from django.db import IntegrityError, models, router, transaction
+from django.core.exceptions import ImproperlyConfigured
+from django.db import IntegrityError, connections, models, router, transaction
+from django.db.models.functions import Greatest
 from django.utils.text import slugify
 from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
@@ -119,7 +124,49 @@ class TagBase(NaturalKeyModel):
 class TagQuerySet(models.QuerySet):
 
     def orphaned(self):
-        return self.filter(taggit_taggeditem_items=None)
+        """
+        Returns the tags without tagged items, in any of their through models.
+        """
+        return self.filter(
+            *[
+                ~models.Exists(
+                    through._default_manager.filter(tag=models.OuterRef("pk"))
+                )
+                for through in get_through_models(self.model)
+            ]
+        )
+
+    def related_tags(self, tag, limit=None, content_type=None):
+        """
+        Returns the tags used on the same objects as ``tag``, annotated with
+        the number of objects using both as ``num_times``, most used first.
+
+        ``content_type`` (a model or a ``ContentType``) only counts the
+        objects of that type. This reads the co-occurrence counts, so it
+        requires ``TAGGIT_TRACK_TAG_COOCCURRENCES``.
+        """
+        cooccurrence_model = TagCooccurrenceBase.for_tag_model(self.model)
+        if cooccurrence_model is None or not getattr(
+            settings, "TAGGIT_TRACK_TAG_COOCCURRENCES", False
+        ):
+            raise ImproperlyConfigured(
+                "related_tags() requires TAGGIT_TRACK_TAG_COOCCURRENCES to be "
+                "enabled and a co-occurrence model for %s." % self.model._meta.label
+            )
+
+        rel = cooccurrence_model._meta.get_field("tag").related_query_name()
+        filters = {"%s__other_tag" % rel: tag}
+        if content_type is not None:
+            if not isinstance(content_type, ContentType):
+                content_type = ContentType.objects.get_for_model(content_type)
+            filters["%s__content_type" % rel] = content_type
+        queryset = (
+            self.filter(**filters)
+            .annotate(num_times=models.Sum("%s__count" % rel))
+            .filter(num_times__gt=0)
+            .order_by("-num_times", "pk")
+        )
+        return queryset if limit is None else queryset[:limit]
 
 
 class Tag(TagBase):
@@ -161,13 +208,15 @@ class ItemBase(NaturalKeyModel):
         return {"content_object": instance}
 
     @classmethod
-    def tags_for(cls, model, instance=None, **extra_filters):
+    def tags_for(cls, model, instance=None, queryset=None, **extra_filters):
+        if queryset is None:
+            queryset = cls.tag_model().objects.all()
         kwargs = extra_filters or {}
         if instance is not None:
             kwargs.update({"%s__content_object" % cls.tag_relname(): instance})
-            return cls.tag_model().objects.filter(**kwargs)
+            return queryset.filter(**kwargs)
         kwargs.update({"%s__content_object__isnull" % cls.tag_relname(): False})
-        return cls.tag_model().objects.filter(**kwargs).distinct()
+        return queryset.filter(**kwargs).distinct()
 
 
 class TaggedItemBase(ItemBase):
@@ -199,18 +248,28 @@ class CommonGenericTaggedItemBase(ItemBase):
         }
 
     @classmethod
-    def tags_for(cls, model, instance=None, **extra_filters):
+    def tags_for(cls, model, instance=None, queryset=None, **extra_filters):
+        if queryset is None:
+            queryset = cls.tag_model().objects.all()
         tag_relname = cls.tag_relname()
-        model = model._meta.concrete_model
+        if instance is not None:
+            # filter on the content type id directly (the content type is
+            # cached), rather than joining the content type table. The rows of
+            # a single object are unique, so there are no duplicates to remove.
+            kwargs = {
+                "%s__content_type"
+                % tag_relname: ContentType.objects.get_for_model(model),
+                "%s__object_id" % tag_relname: instance.pk,
+                **extra_filters,
+            }
+            return queryset.filter(**kwargs)
+        # model level querysets may be built before the content types exist
+        # (at import time), so they don't look the content type up
         kwargs = {
-            "%s__content_type__app_label" % tag_relname: model._meta.app_label,
-            "%s__content_type__model" % tag_relname: model._meta.model_name,
+            "%s__content_type" % tag_relname: content_type_subquery(model),
+            **extra_filters,
         }
-        if instance is not None:
-            kwargs["%s__object_id" % tag_relname] = instance.pk
-        if extra_filters:
-            kwargs.update(extra_filters)
-        return cls.tag_model().objects.filter(**kwargs).distinct()
+        return queryset.filter(**kwargs).distinct()
 
 
 class GenericTaggedItemBase(CommonGenericTaggedItemBase):
@@ -235,7 +294,11 @@ class TaggedItem(GenericTaggedItemBase, TaggedItemBase):
         indexes = [
             models.Index(
                 fields=["content_type", "object_id"],
-            )
+            ),
+            # the objects of a content type with a tag, in order
+            models.Index(
+                fields=["tag", "content_type", "object_id"],
+            ),
         ]
 
         constraints = [
@@ -244,3 +307,413 @@ class TaggedItem(GenericTaggedItemBase, TaggedItemBase):
                 name="taggit_taggeditem_content_type_id_object_id_tag_id_4bb97a8e_uniq",
             )
         ]
+
+
+class CounterBase(models.Model):
+    """
+    Base for the denormalized counters kept for a tag model, per through
+    model and content type.
+
+    Subclasses need a ``tag`` foreign key to the tag model (with a reverse
+    relation), and ``key_fields`` naming the attributes that identify a row
+    besides ``through``.
+    """
+
+    through = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        verbose_name=_("through model"),
+        related_name="+",
+    )
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        verbose_name=_("content type"),
+        related_name="+",
+    )
+    count = models.PositiveIntegerField(verbose_name=_("count"), default=0)
+
+    key_fields = ()
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def for_tag_model(cls, tag_model):
+        """
+        Returns the concrete subclass counting ``tag_model``, if any.
+        """
+        concrete_model = tag_model._meta.concrete_model
+        for model in apps.get_models():
+            if not issubclass(model, cls) or model._meta.proxy:
+                continue
+            if model._meta.get_field("tag").related_model is concrete_model:
+                return model
+        return None
+
+    @classmethod
+    def update_counts(cls, through, deltas, using):
+        """
+        Adds the ``{key: delta}`` dict ``deltas`` to the counts of
+        ``through``, where each key holds the values of ``key_fields``.
+        """
+        deltas = {key: delta for key, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        through_type = ContentType.objects.get_for_model(through)
+        manager = cls._default_manager.using(using)
+
+        new_rows = [
+            cls(through=through_type, **dict(zip(cls.key_fields, key)))
+            for key, delta in deltas.items()
+            if delta > 0
+        ]
+        if new_rows and connections[using].features.supports_ignore_conflicts:
+            manager.bulk_create(new_rows, ignore_conflicts=True)
+        else:
+            for row in new_rows:
+                manager.get_or_create(
+                    through=through_type,
+                    **{field: getattr(row, field) for field in cls.key_fields},
+                )
+
+        # one UPDATE per distinct delta (usually just +1 or -1), matching the
+        # rows on their leading key fields and an IN on the last one
+        *prefix_fields, last_field = cls.key_fields
+        keys_for_delta = {}
+        for (*prefix, last), delta in deltas.items():
+            keys_for_delta.setdefault(delta, {}).setdefault(tuple(prefix), []).append(
+                last
+            )
+        for delta, keys in keys_for_delta.items():
+            q = models.Q()
+            for prefix, values in keys.items():
+                q |= models.Q(
+                    **dict(zip(prefix_fields, prefix)),
+                    **{"%s__in" % last_field: values},
+                )
+            manager.filter(q, through=through_type).update(
+                count=Greatest(models.F("count") + delta, 0)
+            )
+
+    @classmethod
+    def rebuild(cls, using=None, batch_size=1000):
+        """
+        Recomputes all of the counts from the through model rows.
+        """
+        using = using or router.db_for_write(cls)
+        manager = cls._default_manager.using(using)
+        tag_model = cls._meta.get_field("tag").related_model
+        with transaction.atomic(using=using):
+            manager.all().delete()
+            for through in get_through_models(tag_model):
+                through_type = ContentType.objects.get_for_model(through)
+                manager.bulk_create(
+                    (
+                        cls(
+                            through=through_type,
+                            count=count,
+                            **dict(zip(cls.key_fields, key)),
+                        )
+                        for key, count in cls.compute_counts(through, using)
+                    ),
+                    batch_size=batch_size,
+                )
+
+    @classmethod
+    def compute_counts(cls, through, using):
+        """
+        Yields the ``(key, count)`` pairs of ``through``, from its rows.
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def object_keys(cls, tag_ids):
+        """
+        Returns the keys, without the content type, that an object tagged with
+        ``tag_ids`` is counted under.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _through_rows(through, using):
+        """
+        The ``(content_type_id, object_id, tag_id)`` rows of ``through``,
+        ordered by object.
+        """
+        rows = through._default_manager.using(using)
+        if issubclass(through, CommonGenericTaggedItemBase):
+            object_field = "object_id"
+        else:
+            content_object = through._meta.get_field("content_object")
+            content_type = ContentType.objects.get_for_model(
+                content_object.related_model
+            )
+            rows = rows.annotate(content_type_id=models.Value(content_type.pk))
+            object_field = content_object.attname
+        return rows.values_list("content_type_id", object_field, "tag_id").order_by(
+            "content_type_id", object_field
+        )
+
+
+class TagCountBase(CounterBase):
+    """
+    Denormalized number of times each tag is used, per through model and
+    content type.
+
+    The counts are only maintained when ``TAGGIT_TRACK_TAG_COUNTS`` is
+    enabled. To count a custom tag model, subclass this with a ``tag``
+    foreign key to it (with a reverse relation) and a unique constraint on
+    ``("tag", "through", "content_type")``.
+    """
+
+    key_fields = ("content_type_id", "tag_id")
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return gettext("%(tag)s used %(count)s times") % {
+            "tag": self.tag,
+            "count": self.count,
+        }
+
+    @classmethod
+    def compute_counts(cls, through, using):
+        rows = (
+            cls._through_rows(through, using)
+            .values_list("content_type_id", "tag_id")
+            .order_by()
+        )
+        for ct_id, tag_id, count in rows.annotate(n=models.Count("pk")).iterator():
+            yield (ct_id, tag_id), count
+
+    @classmethod
+    def object_keys(cls, tag_ids):
+        return {(tag_id,) for tag_id in tag_ids}
+
+
+class TagCount(TagCountBase):
+    tag = models.ForeignKey(
+        Tag, on_delete=models.CASCADE, verbose_name=_("tag"), related_name="counts"
+    )
+
+    class Meta:
+        app_label = "taggit"
+        verbose_name = _("tag count")
+        verbose_name_plural = _("tag counts")
+        constraints = [
+            models.UniqueConstraint(
+                fields=("tag", "through", "content_type"),
+                name="taggit_tagcount_tag_through_content_type_uniq",
+            )
+        ]
+
+
+class TagCooccurrenceBase(CounterBase):
+    """
+    Denormalized number of objects tagged with both ``tag`` and
+    ``other_tag``, per through model and content type. Each pair of tags is
+    stored both ways around.
+
+    The counts are only maintained when ``TAGGIT_TRACK_TAG_COOCCURRENCES``
+    is enabled. To track a custom tag model, subclass this with ``tag`` (with
+    a reverse relation) and ``other_tag`` foreign keys to it, and a unique
+    constraint on ``("tag", "other_tag", "through", "content_type")``.
+    """
+
+    key_fields = ("content_type_id", "tag_id", "other_tag_id")
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return gettext("%(tag)s used with %(other_tag)s %(count)s times") % {
+            "tag": self.tag,
+            "other_tag": self.other_tag,
+            "count": self.count,
+        }
+
+    @staticmethod
+    def pairs(tag_ids, changed_ids):
+        """
+        Returns the ``(tag_id, other_tag_id)`` pairs of ``tag_ids`` that
+        involve at least one of ``changed_ids``.
+        """
+        return {
+            pair
+            for tag_id in changed_ids
+            for other_tag_id in tag_ids
+            if tag_id != other_tag_id
+            for pair in ((tag_id, other_tag_id), (other_tag_id, tag_id))
+        }
+
+    @classmethod
+    def compute_counts(cls, through, using):
+        counts = {}
+        for (ct_id, object_id), object_rows in groupby(
+            cls._through_rows(through, using).iterator(), key=lambda row: row[:2]
+        ):
+            tag_ids = {row[2] for row in object_rows}
+            for pair in cls.object_keys(tag_ids):
+                key = (ct_id, *pair)
+                counts[key] = counts.get(key, 0) + 1
+        yield from counts.items()
+
+    @classmethod
+    def object_keys(cls, tag_ids):
+        return cls.pairs(tag_ids, tag_ids)
+
+
+class TagCooccurrence(TagCooccurrenceBase):
+    tag = models.ForeignKey(
+        Tag,
+        on_delete=models.CASCADE,
+        verbose_name=_("tag"),
+        related_name="cooccurrences",
+    )
+    other_tag = models.ForeignKey(
+        Tag, on_delete=models.CASCADE, verbose_name=_("other tag"), related_name="+"
+    )
+
+    class Meta:
+        app_label = "taggit"
+        verbose_name = _("tag co-occurrence")
+        verbose_name_plural = _("tag co-occurrences")
+        constraints = [
+            models.UniqueConstraint(
+                fields=("tag", "other_tag", "through", "content_type"),
+                name="taggit_tagcooccurrence_tags_through_content_type_uniq",
+            )
+        ]
+
+
+def content_type_subquery(model):
+    """
+    The id of the content type of ``model``, as a subquery, for querysets that
+    must not query the database before they are evaluated.
+    """
+    opts = model._meta.concrete_model._meta
+    return models.Subquery(
+        ContentType.objects.filter(
+            app_label=opts.app_label, model=opts.model_name
+        ).values("pk")
+    )
+
+
+def _update_merged_tag_counters(tag_model, through, object_fields, targets, using):
+    """
+    Updates the tag counts and co-occurrences of ``through``, when tracked,
+    for the merge of the tags in ``targets``, from the tags of the objects
+    having one of them.
+    """
+    counter_models = [
+        counter_base.for_tag_model(tag_model)
+        for counter_base, setting in [
+            (TagCountBase, "TAGGIT_TRACK_TAG_COUNTS"),
+            (TagCooccurrenceBase, "TAGGIT_TRACK_TAG_COOCCURRENCES"),
+        ]
+        if getattr(settings, setting, False)
+    ]
+    counter_models = [model for model in counter_models if model is not None]
+    if not counter_models:
+        return
+    merged = through._default_manager.using(using).filter(
+        tag_id__in=targets,
+        **{field: models.OuterRef(field) for field in object_fields},
+    )
+    rows = CounterBase._through_rows(through, using).filter(models.Exists(merged))
+    deltas = {model: {} for model in counter_models}
+    for (ct_id, _object_id), object_rows in groupby(
+        rows.iterator(), key=lambda row: row[:2]
+    ):
+        old_ids = {row[2] for row in object_rows}
+        new_ids = {targets.get(pk, pk) for pk in old_ids}
+        for model, model_deltas in deltas.items():
+            old_keys = model.object_keys(old_ids)
+            new_keys = model.object_keys(new_ids)
+            for keys, delta in [(old_keys - new_keys, -1), (new_keys - old_keys, 1)]:
+                for key in keys:
+                    key = (ct_id, *key)
+                    model_deltas[key] = model_deltas.get(key, 0) + delta
+    for model, model_deltas in deltas.items():
+        model.update_counts(through, model_deltas, using)
+
+
+def get_through_models(tag_model):
+    """
+    Returns the (non proxy) through models using ``tag_model``.
+    """
+    concrete_model = tag_model._meta.concrete_model
+    through_models = []
+    for model in apps.get_models():
+        if not issubclass(model, ItemBase) or model._meta.proxy:
+            continue
+        if model.tag_model()._meta.concrete_model is concrete_model:
+            through_models.append(model)
+    return through_models
+
+
+def merge_tags(source_tags, target_tag, chunk_size=500):
+    """
+    Merges ``source_tags`` (tags or a queryset of tags) into ``target_tag``:
+    their tagged items, in every through model, are moved over to
+    ``target_tag`` (or dropped when the object already has it) and the source
+    tags are deleted.
+
+    Each chunk of ``chunk_size`` source tags is merged in its own transaction,
+    with a few bulk statements. Returns the number of merged tags.
+    """
+    if isinstance(source_tags, models.QuerySet):
+        source_ids = list(source_tags.values_list("pk", flat=True))
+    else:
+        source_ids = [tag.pk for tag in source_tags]
+    source_ids = [pk for pk in dict.fromkeys(source_ids) if pk != target_tag.pk]
+    tag_model = type(target_tag)
+    using = target_tag._state.db or router.db_for_write(tag_model)
+    for start in range(0, len(source_ids), chunk_size):
+        end = start + chunk_size
+        targets = {pk: target_tag.pk for pk in source_ids[start:end]}
+        with transaction.atomic(using=using):
+            _merge_tags(tag_model, targets, using)
+    return len(source_ids)
+
+
+def _merge_tags(tag_model, targets, using):
+    """
+    Moves the tagged items of the tags in ``targets`` (a ``{tag id: target
+    tag id}`` dict) over to their target tag, then deletes them. Takes two
+    statements per through model, however many tags and items are merged,
+    plus the tag counter updates when they are tracked.
+    """
+    for through in get_through_models(tag_model):
+        if issubclass(through, CommonGenericTaggedItemBase):
+            object_fields = ["content_type_id", "object_id"]
+        else:
+            object_fields = [through._meta.get_field("content_object").attname]
+        _update_merged_tag_counters(tag_model, through, object_fields, targets, using)
+        # the tag each row ends up with
+        target = models.Case(
+            *[
+                models.When(tag_id=pk, then=models.Value(target_id))
+                for pk, target_id in targets.items()
+            ],
+            default=models.F("tag_id"),
+            output_field=through._meta.get_field("tag").target_field,
+        )
+        items = through._default_manager.using(using)
+        moved = items.filter(tag_id__in=targets).annotate(target_id=target)
+        # a row is a conflict when its object already has the target tag, or
+        # has another tag merged into it with a smaller pk
+        has_target = models.Q(tag_id=models.OuterRef("target_id"))
+        conflicts = items.annotate(target_id=target).filter(
+            has_target | models.Q(pk__lt=models.OuterRef("pk")),
+            target_id=models.OuterRef("target_id"),
+            **{field: models.OuterRef(field) for field in object_fields},
+        )
+        items.filter(
+            pk__in=moved.filter(models.Exists(conflicts)).values("pk")
+        ).delete()
+        items.filter(tag_id__in=targets).update(tag_id=target)
+
+    tag_model._default_manager.using(using).filter(pk__in=targets).delete()
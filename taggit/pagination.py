@@ -0,0 +1,116 @@
+"""
+Keyset (cursor) pagination of the objects tagged with a tag.
+
+Unlike page numbers, which turn into an ``OFFSET`` the database has to walk
+through, each page starts right after the last object of the previous one,
+following the ``(tag, content_type, object_id)`` index of the through table.
+"""
+
+import base64
+import binascii
+import json
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
+
+from taggit.models import CommonGenericTaggedItemBase, TaggedItem
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class CursorPage:
+    def __init__(self, object_list, next_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+
+    def __repr__(self):
+        return "<CursorPage of %d objects>" % len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+class TagCursorPaginator:
+    """
+    Pages through the objects of ``queryset`` tagged with ``tag``, ordered by
+    primary key, ``per_page`` at a time.
+
+    ``through`` is the through model of the tags, ``TaggedItem`` by default.
+    The cursors are opaque strings, suitable for a query parameter.
+    """
+
+    def __init__(self, queryset, tag, per_page, through=TaggedItem):
+        self.queryset = queryset
+        self.tag = tag
+        self.per_page = int(per_page)
+        self.through = through
+        if issubclass(through, CommonGenericTaggedItemBase):
+            self.object_field = through._meta.get_field("object_id")
+            self.key_field = self.object_field
+        else:
+            self.object_field = through._meta.get_field("content_object")
+            self.key_field = self.object_field.target_field
+
+    def get_rows(self):
+        """
+        The through rows of ``tag`` for our model, in index order.
+        """
+        rows = self.through._default_manager.using(self.queryset.db).filter(
+            tag=self.tag
+        )
+        if issubclass(self.through, CommonGenericTaggedItemBase):
+            rows = rows.filter(
+                content_type=ContentType.objects.get_for_model(self.queryset.model)
+            )
+        return rows.order_by(self.object_field.attname)
+
+    def page(self, cursor=None):
+        """
+        Returns the page starting after ``cursor`` (or the first page), as a
+        ``CursorPage`` holding the objects and the cursor of the next page.
+
+        Raises ``InvalidCursor`` for a cursor that wasn't made by this
+        paginator.
+        """
+        last = self.decode_cursor(cursor) if cursor else None
+        object_list = []
+        # rows of objects filtered out of the queryset (or deleted) leave
+        # holes in a page, keep reading until it is full
+        while True:
+            rows = self.get_rows()
+            if last is not None:
+                rows = rows.filter(**{"%s__gt" % self.object_field.attname: last})
+            limit = self.per_page - len(object_list) + 1
+            object_ids = list(
+                rows.values_list(self.object_field.attname, flat=True)[:limit]
+            )
+            objects = self.queryset.in_bulk(object_ids[: limit - 1])
+            for object_id in object_ids[: limit - 1]:
+                if object_id in objects:
+                    object_list.append(objects[object_id])
+                last = object_id
+            if len(object_ids) < limit:
+                # nothing after this page
+                return CursorPage(object_list, None)
+            if len(object_list) == self.per_page:
+                return CursorPage(object_list, self.encode_cursor(last))
+
+    def encode_cursor(self, object_id):
+        value = json.dumps([str(object_id)])
+        return base64.urlsafe_b64encode(value.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        try:
+            value = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            (object_id,) = json.loads(value)
+            return self.key_field.to_python(object_id)
+        except (binascii.Error, ValueError, TypeError, ValidationError):
+            raise InvalidCursor("Invalid cursor %r." % cursor)
@@ -5,11 +5,17 @@ Originally vendored from https://github.com/glemmaPaul/django-taggit-serializer
 """
 
 import json
+from collections import defaultdict
+from operator import attrgetter
 
 # Third party
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
 from django.utils.translation import gettext_lazy
 from rest_framework import serializers
 
+from taggit.managers import TaggableManager
+
 
 class TagList(list):
     """
@@ -17,20 +23,24 @@ class TagList(list):
     serializer
     """
 
-    def __init__(self, *args, **kwargs):
-        pretty_print = kwargs.pop("pretty_print", True)
+    __slots__ = ("pretty_print",)
+
+    def __init__(self, *args, pretty_print=True, **kwargs):
         super().__init__(*args, **kwargs)
         self.pretty_print = pretty_print
 
     def __add__(self, rhs):
-        return TagList(super().__add__(rhs))
+        if not isinstance(rhs, list):
+            return NotImplemented
+        result = TagList(self, pretty_print=self.pretty_print)
+        result.extend(rhs)
+        return result
 
     def __getitem__(self, item):
         result = super().__getitem__(item)
-        try:
-            return TagList(result)
-        except TypeError:
-            return result
+        if isinstance(item, slice):
+            return TagList(result, pretty_print=self.pretty_print)
+        return result
 
     def __str__(self):
         if self.pretty_print:
@@ -100,17 +110,151 @@ class TagListSerializerField(serializers.ListField):
     def to_representation(self, value):
         if not isinstance(value, TagList):
             if not isinstance(value, list):
+                tags = value.all()
                 if self.order_by:
-                    tags = value.all().order_by(*self.order_by)
-                else:
-                    tags = value.all()
+                    tags = self._order_tags(tags)
                 value = [tag.name for tag in tags]
             value = TagList(value, pretty_print=self.pretty_print)
 
         return value
 
+    def _order_tags(self, tags):
+        """
+        Orders ``tags`` by ``order_by``, in Python when they were prefetched
+        and ``order_by`` only names non-null, non-relational fields of the tag
+        model (which Python can compare), and by the database otherwise.
+        """
+        fields = [field.removeprefix("-") for field in self.order_by]
+        prefetched = tags._result_cache is not None
+        if not prefetched or not all(
+            self._sortable_in_python(tags.model, field) for field in fields
+        ):
+            return tags.order_by(*self.order_by)
+        tags = list(tags)
+        # sorts are stable, so sorting by the last field first orders by all
+        for field, ordering in reversed(list(zip(fields, self.order_by))):
+            tags.sort(key=attrgetter(field), reverse=ordering.startswith("-"))
+        return tags
+
+    @staticmethod
+    def _sortable_in_python(model, name):
+        if "__" in name or name == "?":
+            return False
+        try:
+            field = model._meta.pk if name == "pk" else model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return False
+        return field.concrete and not field.is_relation and not field.null
+
+
+class TaggitListSerializer(serializers.ListSerializer):
+    """
+    The list serializer of ``TaggitSerializer``, which prefetches the tags of
+    the objects it serializes (unless they were already prefetched), and sets
+    the tags of the objects it creates in bulk.
+    """
+
+    def create(self, validated_data):
+        if self._child_overrides_tag_saving():
+            # the child may read or adjust the tags itself, so let it save
+            # each object (and its tags) as it would on its own
+            return super().create(validated_data)
+
+        objects = []
+        to_be_tagged = []
+        for attrs in validated_data:
+            tags, attrs = self.child._pop_tags(attrs)
+            objects.append(self.child.create(attrs))
+            to_be_tagged.append(tags)
+
+        self._save_tags(objects, to_be_tagged)
+        return objects
+
+    def _child_overrides_tag_saving(self):
+        """
+        Whether the child serializer customizes how its objects and their tags
+        are saved, which setting the tags in bulk would bypass.
+        """
+        child_class = type(self.child)
+        return any(
+            getattr(child_class, name) is not getattr(TaggitSerializer, name)
+            for name in ("create", "_save_tags", "_pop_tags")
+        )
+
+    def _save_tags(self, objects, to_be_tagged):
+        """
+        Sets the tags of all of ``objects`` with one ``bulk_set()`` per tag
+        field, which takes a fixed number of queries per batch of objects.
+        """
+        instance_tags = defaultdict(list)
+        for tag_object, tags in zip(objects, to_be_tagged):
+            for key, tag_values in tags.items():
+                instance_tags[key].append((tag_object, tag_values))
+
+        for key, pairs in instance_tags.items():
+            getattr(type(pairs[0][0]), key).bulk_set(pairs)
+
+    def to_representation(self, data):
+        if isinstance(data, models.manager.BaseManager):
+            data = data.all()
+        if isinstance(data, models.QuerySet):
+            lookups = self._tag_lookups(data.model)
+            lookups = [
+                lookup
+                for lookup in lookups
+                if lookup not in data._prefetch_related_lookups
+            ]
+            if lookups:
+                data = data.prefetch_related(*lookups)
+        else:
+            data = list(data)
+            # the items may as well be dicts or other plain objects
+            if data and isinstance(data[0], models.Model):
+                models.prefetch_related_objects(data, *self._tag_lookups(type(data[0])))
+        return super().to_representation(data)
+
+    def _tag_lookups(self, model):
+        """
+        The ``TaggableManager`` fields of ``model`` read by the tag fields of
+        the child serializer.
+        """
+        lookups = []
+        for field in self.child.fields.values():
+            if not isinstance(field, TagListSerializerField) or field.write_only:
+                continue
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                continue
+            if isinstance(model_field, TaggableManager):
+                lookups.append(field.source)
+        return lookups
+
 
 class TaggitSerializer(serializers.Serializer):
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        # as BaseSerializer.many_init(), defaulting to our list serializer
+        # instead of ListSerializer
+        list_kwargs = {}
+        for key in serializers.LIST_SERIALIZER_KWARGS_REMOVE:
+            value = kwargs.pop(key, None)
+            if value is not None:
+                list_kwargs[key] = value
+        list_kwargs["child"] = cls(*args, **kwargs)
+        list_kwargs.update(
+            {
+                key: value
+                for key, value in kwargs.items()
+                if key in serializers.LIST_SERIALIZER_KWARGS
+            }
+        )
+        meta = getattr(cls, "Meta", None)
+        list_serializer_class = getattr(
+            meta, "list_serializer_class", TaggitListSerializer
+        )
+        return list_serializer_class(*args, **list_kwargs)
+
     def create(self, validated_data):
         to_be_tagged, validated_data = self._pop_tags(validated_data)
 
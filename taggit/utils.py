@@ -1,4 +1,6 @@
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.utils.functional import wraps
 from django.utils.module_loading import import_string
 
@@ -21,58 +23,26 @@ def _parse_tags(tagstring):
     # input, we don't *do* a recall... I mean, we know we only need to
     # split on spaces.
     if "," not in tagstring and '"' not in tagstring:
-        words = list(set(split_strip(tagstring, " ")))
-        words.sort()
-        return words
+        return sorted(set(split_strip(tagstring, " ")))
 
-    words = []
-    buffer = []
+    # Splitting on quotes alternates unquoted and quoted sections.
+    sections = tagstring.split('"')
     # Defer splitting of non-quoted sections until we know if there are
     # any unquoted commas.
-    to_be_split = []
-    saw_loose_comma = False
-    open_quote = False
-    i = iter(tagstring)
-    try:
-        while True:
-            c = next(i)
-            if c == '"':
-                if buffer:
-                    to_be_split.append("".join(buffer))
-                    buffer = []
-                # Find the matching quote
-                open_quote = True
-                c = next(i)
-                while c != '"':
-                    buffer.append(c)
-                    c = next(i)
-                if buffer:
-                    word = "".join(buffer).strip()
-                    if word:
-                        words.append(word)
-                    buffer = []
-                open_quote = False
-            else:
-                if not saw_loose_comma and c == ",":
-                    saw_loose_comma = True
-                buffer.append(c)
-    except StopIteration:
-        # If we were parsing an open quote which was never closed treat
-        # the buffer as unquoted.
-        if buffer:
-            if open_quote and "," in buffer:
-                saw_loose_comma = True
-            to_be_split.append("".join(buffer))
-    if to_be_split:
-        if saw_loose_comma:
-            delimiter = ","
-        else:
-            delimiter = " "
-        for chunk in to_be_split:
-            words.extend(split_strip(chunk, delimiter))
-    words = list(set(words))
-    words.sort()
-    return words
+    to_be_split = sections[::2]
+    quoted = sections[1::2]
+    if len(sections) % 2 == 0:
+        # An open quote which is never closed is treated as unquoted.
+        to_be_split.append(quoted.pop())
+    words = [word for word in (section.strip() for section in quoted) if word]
+    if any("," in section for section in to_be_split):
+        delimiter = ","
+    else:
+        delimiter = " "
+    # The sections don't contain quotes, so splitting them joined gives the
+    # same words as splitting them one at a time.
+    words.extend(split_strip(delimiter.join(to_be_split), delimiter))
+    return sorted(set(words))
 
 
 def split_strip(string, delimiter=","):
@@ -126,9 +96,25 @@ def require_instance_manager(func):
     return inner
 
 
+# the functions resolved by get_func(), by (setting, default)
+_funcs = {}
+
+
 def get_func(key, default):
+    try:
+        return _funcs[key, default]
+    except KeyError:
+        pass
     func_path = getattr(settings, key, None)
-    return default if func_path is None else import_string(func_path)
+    func = default if func_path is None else import_string(func_path)
+    _funcs[key, default] = func
+    return func
+
+
+@receiver(setting_changed)
+def clear_funcs(setting, **kwargs):
+    if any(key == setting for key, default in list(_funcs)):
+        _funcs.clear()
 
 
 def parse_tags(tagstring):
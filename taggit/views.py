@@ -1,8 +1,13 @@
 from django.contrib.contenttypes.models import ContentType
+from django.db import connections, router
+from django.db.models import Exists, OuterRef
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.views.generic.list import ListView
 
+from taggit import cache as tag_cache
 from taggit.models import Tag, TaggedItem
+from taggit.pagination import InvalidCursor, TagCursorPaginator
 
 
 def tagged_object_list(request, slug, queryset, **kwargs):
@@ -19,19 +24,55 @@ def tagged_object_list(request, slug, queryset, **kwargs):
 
 class TagListMixin:
     tag_suffix = "_tag"
+    # page through the objects with a cursor (see taggit.pagination) in the
+    # ``cursor_param`` query parameter instead of by page number, which stays
+    # fast however deep the page is
+    keyset_pagination = False
+    cursor_param = "cursor"
 
     def dispatch(self, request, *args, **kwargs):
         slug = kwargs.pop("slug")
-        self.tag = get_object_or_404(Tag, slug=slug)
+        self.tag = self.get_tag(slug)
         return super().dispatch(request, *args, **kwargs)
 
+    def get_tag(self, slug):
+        """
+        Returns the tag with the given slug, going through the tag cache.
+        """
+        db = router.db_for_read(Tag)
+        cached = tag_cache.get_tags(Tag, db, "slug", {slug}, {})
+        if slug in cached:
+            return cached[slug]
+        tag = get_object_or_404(Tag.objects.using(db), slug=slug)
+        tag_cache.cache_tags(Tag, db, "slug", {slug: tag}, {})
+        return tag
+
     def get_queryset(self, **kwargs):
         qs = super().get_queryset(**kwargs)
-        return qs.filter(
-            pk__in=TaggedItem.objects.filter(
-                tag=self.tag, content_type=ContentType.objects.get_for_model(qs.model)
-            ).values_list("object_id", flat=True)
+        items = TaggedItem.objects.filter(
+            tag=self.tag, content_type=ContentType.objects.get_for_model(qs.model)
         )
+        if connections[qs.db].vendor == "mysql":
+            # MySQL may run ``pk IN (...)`` as a dependent subquery, once per
+            # object, which a correlated EXISTS avoids
+            return qs.filter(Exists(items.filter(object_id=OuterRef("pk"))))
+        # elsewhere an uncorrelated subquery, answered from the
+        # (tag, content_type, object_id) index alone, is the fastest
+        return qs.filter(pk__in=items.values("object_id"))
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.keyset_pagination:
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = TagCursorPaginator(queryset, self.tag, page_size)
+        cursor = self.request.GET.get(self.cursor_param)
+        try:
+            page = paginator.page(cursor)
+        except InvalidCursor as e:
+            raise Http404(str(e))
+        self.next_cursor = page.next_cursor
+        is_paginated = bool(cursor) or page.has_next()
+        return (paginator, page, page.object_list, is_paginated)
 
     def get_template_names(self):
         if self.tag_suffix:
@@ -43,4 +84,6 @@ class TagListMixin:
         if "extra_context" not in context:
             context["extra_context"] = {}
         context["extra_context"]["tag"] = self.tag
+        if self.keyset_pagination and self.get_paginate_by(self.object_list):
+            context["next_cursor"] = self.next_cursor
         return context
@@ -2,7 +2,7 @@ import uuid
 
 from django.db import models
 
-from taggit.managers import TaggableManager
+from taggit.managers import TaggableManager, TaggableQuerySet
 from taggit.models import (
     CommonGenericTaggedItemBase,
     GenericTaggedItemBase,
@@ -57,6 +57,7 @@ class Food(models.Model):
     name = models.CharField(max_length=50)
 
     tags = TaggableManager()
+    objects = TaggableQuerySet.as_manager()
 
     def __str__(self):
         return self.name
@@ -116,6 +117,7 @@ class DirectFood(models.Model):
     name = models.CharField(max_length=50)
 
     tags = TaggableManager(through="TaggedFood")
+    objects = TaggableQuerySet.as_manager()
 
     def __str__(self):
         return self.name
@@ -168,6 +170,7 @@ class DirectTrackedFood(models.Model):
     name = models.CharField(max_length=50)
 
     tags = TaggableManager(through=TaggedTrackedFood)
+    objects = TaggableQuerySet.as_manager()
 
     def __str__(self):
         return self.name
@@ -206,6 +209,7 @@ class TaggedCustomPKPet(TaggedItemBase):
 class DirectCustomPKFood(models.Model):
     name = models.CharField(max_length=50, primary_key=True)
     tags = TaggableManager(through=TaggedCustomPKFood)
+    objects = TaggableQuerySet.as_manager()
 
     def __str__(self):
         return self.name
@@ -236,6 +240,7 @@ class CustomPKFood(models.Model):
     name = models.CharField(max_length=50, primary_key=True)
 
     tags = TaggableManager(through=TaggedCustomPK)
+    objects = TaggableQuerySet.as_manager()
 
     def __str__(self):
         return self.name
@@ -275,6 +280,7 @@ class OfficialFood(models.Model):
     name = models.CharField(max_length=50)
 
     tags = TaggableManager(through=OfficialThroughModel)
+    objects = TaggableQuerySet.as_manager()
 
     def __str__(self):
         return self.name
@@ -360,6 +366,7 @@ class UUIDFood(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=50)
     tags = TaggableManager(through="UUIDTaggedItem")
+    objects = TaggableQuerySet.as_manager()
 
     created_at = models.DateTimeField(auto_now_add=True)
 
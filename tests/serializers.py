@@ -11,3 +11,15 @@ class TestModelSerializer(TaggitSerializer, serializers.ModelSerializer):
     class Meta:
         model = TestModel
         fields = "__all__"
+
+
+class OrderedTagListSerializerField(TagListSerializerField):
+    order_by = ["-name"]
+
+
+class OrderedTestModelSerializer(TaggitSerializer, serializers.ModelSerializer):
+    tags = OrderedTagListSerializerField()
+
+    class Meta:
+        model = TestModel
+        fields = "__all__"
@@ -78,3 +78,24 @@ class AdminTest(TestCase):
         self.assertSetEqual(
             {tag.name for tag in self.peach.tags.all()}, {"Yellow", "Red"}
         )
+        # the merged tags are gone
+        self.assertSetEqual(
+            set(Tag.objects.values_list("name", flat=True)), {"Red", "Yellow"}
+        )
+
+    def test_remove_orphaned_tags_action(self):
+        orphan = Tag.objects.create(name="orphan")
+        Tag.objects.create(name="other orphan")
+        pks_to_select = [orphan.pk, Tag.objects.get(name="red").pk]
+        response = self.client.post(
+            reverse("admin:taggit_tag_changelist"),
+            data={
+                "action": "remove_orphaned_tags_action",
+                "_selected_action": pks_to_select,
+            },
+            follow=True,
+        )
+        self.assertContains(response, "Successfully removed 1 orphaned tags.")
+        self.assertFalse(Tag.objects.filter(name="orphan").exists())
+        self.assertTrue(Tag.objects.filter(name="other orphan").exists())
+        self.assertTrue(Tag.objects.filter(name="red").exists())
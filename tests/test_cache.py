@@ -0,0 +1,169 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from taggit.cache import clear_tag_cache, get_tags, local_cache
+from taggit.models import Tag
+from tests.models import (
+    ArticleTag,
+    Food,
+    OfficialFood,
+    OfficialTag,
+    TenantModel,
+    TenantTag,
+)
+
+
+@override_settings(TAGGIT_TAG_CACHE_SIZE=100)
+class TagCacheTestCase(TestCase):
+    def setUp(self):
+        clear_tag_cache()
+        cache.clear()
+
+    def add_tags(self, obj, *tags, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            obj.tags.add(*tags, **kwargs)
+
+    def test_cached_tags_skip_lookup(self):
+        apple = Food.objects.create(name="apple")
+        pear = Food.objects.create(name="pear")
+        self.add_tags(apple, "green", "red")
+
+        # check existing tags, insert the rows
+        with self.assertNumQueries(2):
+            self.add_tags(pear, "green", "red")
+        self.assertEqual(sorted(pear.tags.names()), ["green", "red"])
+
+    def test_custom_tag_model(self):
+        apple = OfficialFood.objects.create(name="apple")
+        pear = OfficialFood.objects.create(name="pear")
+        self.add_tags(apple, "green")
+
+        with self.assertNumQueries(2):
+            self.add_tags(pear, "green")
+        self.assertEqual(list(pear.tags.all()), list(OfficialTag.objects.all()))
+
+    def test_cached_tags_are_deferred(self):
+        apple = Food.objects.create(name="apple")
+        self.add_tags(apple, "green")
+        tag = Tag.objects.get()
+
+        cached = get_tags(Tag, "default", "name", {"green", "red"}, {})
+        self.assertEqual(list(cached), ["green"])
+        self.assertEqual(cached["green"], tag)
+        self.assertEqual(cached["green"].slug, "green")
+        self.assertEqual(cached["green"].get_deferred_fields(), set())
+        self.assertFalse(cached["green"]._state.adding)
+
+    def test_invalidated_on_save_and_delete(self):
+        apple = Food.objects.create(name="apple")
+        self.add_tags(apple, "green")
+
+        tag = Tag.objects.get(name="green")
+        tag.name = "verde"
+        tag.save()
+
+        pear = Food.objects.create(name="pear")
+        self.add_tags(pear, "green")
+        self.assertEqual(Tag.objects.count(), 2)
+        self.assertEqual(list(pear.tags.names()), ["green"])
+
+        Tag.objects.filter(name="green").delete()
+        self.add_tags(pear, "green")
+        self.assertEqual(list(pear.tags.names()), ["green"])
+
+    def test_invalidated_later_in_the_transaction(self):
+        apple = Food.objects.create(name="apple")
+        pear = Food.objects.create(name="pear")
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                apple.tags.add("green", "red")
+                Tag.objects.filter(name="green").update(name="verde")
+                Tag.objects.get(name="verde").save()
+                Tag.objects.get(name="red").delete()
+        self.assertFalse(local_cache._entries)
+
+        self.add_tags(pear, "green", "red")
+        self.assertEqual(sorted(pear.tags.names()), ["green", "red"])
+
+    @override_settings(TAGGIT_TAG_CACHE_SIZE=None, TAGGIT_TAG_CACHE_ALIAS="default")
+    def test_django_cache_backend_invalidated_later_in_the_transaction(self):
+        apple = Food.objects.create(name="apple")
+        pear = Food.objects.create(name="pear")
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                apple.tags.add("green")
+                Tag.objects.get(name="green").delete()
+
+        self.add_tags(pear, "green")
+        self.assertEqual(list(pear.tags.names()), ["green"])
+
+    def test_invalidated_for_proxy_models(self):
+        apple = Food.objects.create(name="apple")
+        self.add_tags(apple, "green")
+        self.assertTrue(local_cache._entries)
+
+        ArticleTag.objects.get(name="green").delete()
+        self.assertFalse(local_cache._entries)
+
+    def test_not_cached_when_rolled_back(self):
+        apple = Food.objects.create(name="apple")
+        apple.tags.add("green")
+        self.assertFalse(local_cache._entries)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        apple = Food.objects.create(name="apple")
+        with self.settings(TAGGIT_TAG_CACHE_SIZE=2):
+            self.add_tags(apple, "green", "red")
+            self.add_tags(apple, "green")
+            self.add_tags(apple, "yellow")
+            self.assertEqual(
+                sorted(key[-1] for key in local_cache._entries), ["green", "yellow"]
+            )
+
+    @override_settings(TAGGIT_CASE_INSENSITIVE=True)
+    def test_case_insensitive(self):
+        apple = Food.objects.create(name="apple")
+        pear = Food.objects.create(name="pear")
+        self.add_tags(apple, "Green")
+
+        with self.assertNumQueries(2):
+            self.add_tags(pear, "GREEN")
+        self.assertEqual(list(pear.tags.names()), ["Green"])
+
+    def test_tag_kwargs_are_part_of_the_key(self):
+        first = TenantModel.objects.create(name="first")
+        second = TenantModel.objects.create(name="second")
+        self.add_tags(first, "green", tag_kwargs={"tenant_id": 1})
+        self.add_tags(second, "green", tag_kwargs={"tenant_id": 2})
+
+        self.assertEqual(TenantTag.objects.count(), 2)
+        self.assertEqual(second.tags.get().tenant_id, 2)
+
+    @override_settings(TAGGIT_TAG_CACHE_SIZE=None, TAGGIT_TAG_CACHE_ALIAS="default")
+    def test_django_cache_backend(self):
+        apple = Food.objects.create(name="apple")
+        pear = Food.objects.create(name="pear")
+        self.add_tags(apple, "green")
+
+        with self.assertNumQueries(2):
+            self.add_tags(pear, "green")
+        self.assertFalse(local_cache._entries)
+
+        Tag.objects.get(name="green").delete()
+        with self.assertNumQueries(5):
+            self.add_tags(pear, "green")
+        self.assertEqual(list(pear.tags.names()), ["green"])
+
+    @override_settings(TAGGIT_TAG_CACHE_SIZE=None, TAGGIT_TAG_CACHE_ALIAS="default")
+    def test_clear_keeps_other_cache_keys(self):
+        apple = Food.objects.create(name="apple")
+        pear = Food.objects.create(name="pear")
+        self.add_tags(apple, "green")
+        cache.set("unrelated", "value")
+
+        clear_tag_cache()
+        self.assertEqual(cache.get("unrelated"), "value")
+        # the tag is looked up again
+        with self.assertNumQueries(3):
+            self.add_tags(pear, "green")
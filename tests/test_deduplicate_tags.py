@@ -5,7 +5,7 @@ from django.core.management import call_command
 from django.test import TestCase
 
 from taggit.models import Tag, TaggedItem
-from tests.models import Food, HousePet
+from tests.models import DirectFood, Food, HousePet, TaggedFood
 
 
 class DeduplicateTagsTests(TestCase):
@@ -67,3 +67,46 @@ class DeduplicateTagsTests(TestCase):
 
         self.assertEqual(Tag.objects.count(), 3)
         self.assertEqual(TaggedItem.objects.count(), 3)
+
+    def test_chunks(self):
+        Tag.objects.create(name="Ruby")
+        ruby = Tag.objects.create(name="RUBY")
+        self.food_item.tags.add(ruby)
+
+        out = StringIO()
+        call_command("deduplicate_tags", chunk_size=1, stdout=out)
+
+        self.assertEqual(
+            sorted(Tag.objects.values_list("name", flat=True)), ["Python", "Ruby"]
+        )
+        self.assertEqual(
+            sorted(self.food_item.tags.values_list("name", flat=True)),
+            ["Python", "Ruby"],
+        )
+        self.assertEqual(
+            list(self.pet_item.tags.values_list("name", flat=True)), ["Python"]
+        )
+        for progress in ["1/3", "2/3", "3/3"]:
+            self.assertIn(f"Merged {progress} duplicate tags.", out.getvalue())
+
+    def test_custom_through_model(self):
+        direct_food = DirectFood.objects.create(name="Apple")
+        direct_food.tags.add(self.tag1, self.tag2)
+        DirectFood.objects.create(name="Pear").tags.add(self.tag3)
+
+        call_command("deduplicate_tags", stdout=StringIO())
+
+        self.assertEqual(
+            TaggedFood.objects.filter(tag=self.tag1).count(),
+            TaggedFood.objects.count(),
+        )
+        self.assertEqual(TaggedFood.objects.count(), 2)
+
+    def test_dry_run(self):
+        out = StringIO()
+        with self.assertNumQueries(1):
+            call_command("deduplicate_tags", dry_run=True, stdout=out)
+
+        self.assertIn("Would merge 2 duplicate tags into 1 tags.", out.getvalue())
+        self.assertEqual(Tag.objects.count(), 3)
+        self.assertEqual(TaggedItem.objects.count(), 3)
@@ -1,9 +1,14 @@
+from unittest import mock
+
 from django import forms
 from django.test import TestCase
 from django.test.utils import override_settings
 
 from taggit.forms import TagField
 from taggit.models import Tag
+from taggit.utils import parse_tags
+from tests.forms import FoodForm
+from tests.models import Food
 
 
 def _test_parse_tags(tagstring):
@@ -60,3 +65,49 @@ class TagFieldTests(TestCase):
         form = TestForm()
 
         self.assertFalse(form.has_changed())
+
+    def test_should_return_False_if_tags_are_reordered(self):
+        class TestForm(forms.Form):
+            tag = TagField()
+
+        form = TestForm(
+            initial={"tag": [Tag(name="b"), Tag(name="a")]}, data={"tag": "a,b"}
+        )
+
+        self.assertFalse(form.has_changed())
+
+    def test_has_changed_with_string_initial(self):
+        class TestForm(forms.Form):
+            tag = TagField()
+
+        self.assertFalse(
+            TestForm(initial={"tag": "b,a"}, data={"tag": "a,b"}).has_changed()
+        )
+        self.assertTrue(
+            TestForm(initial={"tag": "b,c"}, data={"tag": "a,b"}).has_changed()
+        )
+
+    def test_has_changed_reuses_cleaned_data(self):
+        class TestForm(forms.Form):
+            tag = TagField()
+
+        form = TestForm(initial={"tag": [Tag(name="a")]}, data={"tag": "a,b"})
+        with mock.patch("taggit.forms.parse_tags", wraps=parse_tags) as parse:
+            self.assertTrue(form.is_valid())
+            self.assertTrue(form.has_changed())
+        parse.assert_called_once_with("a,b")
+        self.assertEqual(form.cleaned_data["tag"], ["a", "b"])
+
+
+class TagFieldModelFormTests(TestCase):
+    def test_initial_tags_from_prefetch(self):
+        food = Food.objects.create(name="apple")
+        food.tags.add("green", "red")
+        food = Food.objects.prefetch_related("tags").get()
+
+        with self.assertNumQueries(0):
+            form = FoodForm(instance=food, data={"name": "apple", "tags": "red, green"})
+            self.assertFalse(form.has_changed())
+        self.assertEqual(
+            sorted(tag.name for tag in form.initial["tags"]), ["green", "red"]
+        )
@@ -0,0 +1,85 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from taggit.models import Tag, TaggedItem, merge_tags
+from tests.models import DirectFood, Food, HousePet, TaggedFood
+
+
+class MergeTagsTests(TestCase):
+    def setUp(self):
+        self.apple = Food.objects.create(name="apple")
+        self.apple.tags.add("green", "lime", "olive")
+        self.pear = Food.objects.create(name="pear")
+        self.pear.tags.add("lime", "olive")
+        self.kitty = HousePet.objects.create(name="kitty")
+        self.kitty.tags.add("olive")
+
+    def assertTagNames(self, obj, names):
+        self.assertEqual(sorted(obj.tags.values_list("name", flat=True)), names)
+
+    def test_merge_tags(self):
+        green = Tag.objects.get(name="green")
+        count = merge_tags(Tag.objects.filter(name__in=["lime", "olive"]), green)
+
+        self.assertEqual(count, 2)
+        self.assertEqual(list(Tag.objects.values_list("name", flat=True)), ["green"])
+        self.assertTagNames(self.apple, ["green"])
+        self.assertTagNames(self.pear, ["green"])
+        self.assertTagNames(self.kitty, ["green"])
+        self.assertEqual(TaggedItem.objects.count(), 3)
+
+    def test_chunks(self):
+        green = Tag.objects.get(name="green")
+        sources = list(Tag.objects.filter(name__in=["lime", "olive"]))
+        merge_tags(sources, green, chunk_size=1)
+
+        self.assertTagNames(self.apple, ["green"])
+        self.assertTagNames(self.pear, ["green"])
+        self.assertEqual(TaggedItem.objects.count(), 3)
+
+    def test_queries_do_not_depend_on_items(self):
+        green = Tag.objects.get(name="green")
+        with CaptureQueriesContext(connection) as queries:
+            merge_tags([Tag.objects.get(name="lime")], green)
+        for i in range(10):
+            Food.objects.create(name=f"apple {i}").tags.add("green", "olive")
+        with self.assertNumQueries(len(queries)):
+            merge_tags([Tag.objects.get(name="olive")], green)
+        self.assertEqual(TaggedItem.objects.count(), 13)
+
+    def test_target_in_sources(self):
+        lime = Tag.objects.get(name="lime")
+        self.assertEqual(merge_tags(Tag.objects.all(), lime), 2)
+        self.assertEqual(list(Tag.objects.all()), [lime])
+        self.assertTagNames(self.apple, ["lime"])
+
+    def test_direct_through_model(self):
+        apple = DirectFood.objects.create(name="apple")
+        apple.tags.add("green", "lime")
+        DirectFood.objects.create(name="pear").tags.add("lime")
+
+        merge_tags([Tag.objects.get(name="lime")], Tag.objects.get(name="green"))
+        self.assertEqual(
+            set(TaggedFood.objects.values_list("tag__name", flat=True)), {"green"}
+        )
+        self.assertEqual(TaggedFood.objects.count(), 2)
+
+    def test_command(self):
+        out = StringIO()
+        call_command("merge_tags", "fruit", "lime", "olive", stdout=out)
+
+        self.assertIn("Merged 2 tags into 'fruit'.", out.getvalue())
+        self.assertEqual(
+            sorted(Tag.objects.values_list("name", flat=True)), ["fruit", "green"]
+        )
+        self.assertTagNames(self.apple, ["fruit", "green"])
+        self.assertTagNames(self.kitty, ["fruit"])
+
+    def test_command_unknown_tags(self):
+        with self.assertRaisesMessage(CommandError, "Unknown tags: nope, pear."):
+            call_command("merge_tags", "green", "pear", "lime", "nope")
+        self.assertEqual(Tag.objects.count(), 3)
@@ -0,0 +1,87 @@
+from django.test import TestCase
+
+from taggit.models import Tag
+from taggit.pagination import InvalidCursor, TagCursorPaginator
+from tests.models import DirectFood, Food, TaggedFood, UUIDFood, UUIDTag, UUIDTaggedItem
+
+
+class TagCursorPaginatorTests(TestCase):
+    def create_foods(self, model, names, tag="green"):
+        foods = []
+        for name in names:
+            food = model.objects.create(name=name)
+            food.tags.add(tag)
+            foods.append(food)
+        return sorted(foods, key=lambda food: food.pk)
+
+    def walk(self, paginator):
+        pages = []
+        cursor = None
+        while True:
+            page = paginator.page(cursor)
+            pages.append(list(page))
+            if not page.has_next():
+                return pages
+            cursor = page.next_cursor
+
+    def test_pages(self):
+        foods = self.create_foods(Food, ["apple", "lime", "pear", "kiwi", "plum"])
+        Food.objects.create(name="cherry").tags.add("red")
+        paginator = TagCursorPaginator(
+            Food.objects.all(), Tag.objects.get(name="green"), 2
+        )
+        self.assertEqual(self.walk(paginator), [foods[:2], foods[2:4], foods[4:]])
+
+    def test_page_queries(self):
+        self.create_foods(Food, ["apple", "lime", "pear"])
+        paginator = TagCursorPaginator(
+            Food.objects.all(), Tag.objects.get(name="green"), 2
+        )
+        # the object ids, then the objects
+        with self.assertNumQueries(2):
+            page = paginator.page()
+        with self.assertNumQueries(2):
+            self.assertEqual(len(paginator.page(page.next_cursor)), 1)
+
+    def test_filtered_queryset(self):
+        foods = self.create_foods(Food, ["apple", "lime", "pear", "kiwi", "plum"])
+        paginator = TagCursorPaginator(
+            Food.objects.exclude(name__in=["lime", "pear"]),
+            Tag.objects.get(name="green"),
+            2,
+        )
+        self.assertEqual(
+            self.walk(paginator),
+            [[foods[0], foods[3]], [foods[4]]],
+        )
+
+    def test_exact_last_page(self):
+        foods = self.create_foods(Food, ["apple", "lime"])
+        paginator = TagCursorPaginator(
+            Food.objects.all(), Tag.objects.get(name="green"), 2
+        )
+        page = paginator.page()
+        self.assertEqual(list(page), foods)
+        self.assertFalse(page.has_next())
+
+    def test_direct_through_model(self):
+        foods = self.create_foods(DirectFood, ["apple", "lime", "pear"])
+        paginator = TagCursorPaginator(
+            DirectFood.objects.all(), Tag.objects.get(name="green"), 2, TaggedFood
+        )
+        self.assertEqual(self.walk(paginator), [foods[:2], foods[2:]])
+
+    def test_uuid_object_ids(self):
+        foods = self.create_foods(UUIDFood, ["apple", "lime", "pear"])
+        paginator = TagCursorPaginator(
+            UUIDFood.objects.all(), UUIDTag.objects.get(name="green"), 2, UUIDTaggedItem
+        )
+        self.assertEqual(self.walk(paginator), [foods[:2], foods[2:]])
+
+    def test_invalid_cursor(self):
+        paginator = TagCursorPaginator(
+            Food.objects.all(), Tag.objects.create(name="green"), 2
+        )
+        for cursor in ["nope", "bm9wZQ", "WyJub3BlIl0"]:
+            with self.subTest(cursor=cursor), self.assertRaises(InvalidCursor):
+                paginator.page(cursor)
@@ -1,8 +1,11 @@
+from io import StringIO
+from unittest import mock
+
 from django.core.management import call_command
 from django.test import TestCase
 
 from taggit.models import Tag
-from tests.models import Food, HousePet
+from tests.models import DirectFood, Food, HousePet
 
 
 class RemoveOrphanedTagsTests(TestCase):
@@ -56,3 +59,36 @@ class RemoveOrphanedTagsTests(TestCase):
         self.assertTrue(Tag.objects.filter(name="Used").exists())
         self.assertTrue(Tag.objects.filter(name="Orphan1").exists())
         self.assertTrue(Tag.objects.filter(name="Orphan2").exists())
+
+    def test_custom_through_models(self):
+        DirectFood.objects.create(name="Pear").tags.add(self.orphan_tag1)
+
+        self.assertEqual(list(Tag.objects.orphaned()), [self.orphan_tag2])
+        call_command("remove_orphaned_tags", stdout=StringIO())
+        self.assertEqual(
+            sorted(Tag.objects.values_list("name", flat=True)), ["Orphan1", "Used"]
+        )
+
+    def test_batches(self):
+        out = StringIO()
+        with mock.patch("time.sleep") as sleep:
+            call_command("remove_orphaned_tags", batch_size=1, sleep=0.5, stdout=out)
+
+        self.assertEqual(list(Tag.objects.all()), [self.used_tag])
+        self.assertEqual(
+            out.getvalue().splitlines(),
+            [
+                "Removed 1 orphaned tags so far",
+                "Removed 2 orphaned tags so far",
+                "Successfully removed 2 orphaned tags",
+            ],
+        )
+        sleep.assert_called_with(0.5)
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_dry_run(self):
+        out = StringIO()
+        call_command("remove_orphaned_tags", dry_run=True, stdout=out)
+
+        self.assertIn("Would remove 2 orphaned tags", out.getvalue())
+        self.assertEqual(Tag.objects.count(), 3)
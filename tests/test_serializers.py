@@ -5,13 +5,18 @@ test_django-taggit-serializer
 Tests for `django-taggit-serializer` models module.
 """
 
-from django.test import TestCase
+import pickle
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import serializers as rest_framework_serializers
 from rest_framework.exceptions import ValidationError
 
 from taggit import serializers
 
-from .models import TestModel
-from .serializers import TestModelSerializer
+from .models import DirectTrackedFood, TestModel, TrackedTag
+from .serializers import OrderedTestModelSerializer, TestModelSerializer
 
 
 class TestTaggit_serializer(TestCase):
@@ -101,3 +106,175 @@ class TestTaggit_serializer(TestCase):
         test_model = serializer.save()
 
         assert set(serializer.data["tags"]) == {"2", "3"}
+
+
+class TaggitListSerializerTests(TestCase):
+    def setUp(self):
+        objs = TestModel.objects.bulk_create(TestModel() for _i in range(1000))
+        TestModel.tags.bulk_add([(obj, ["a", "c", str(obj.pk % 2)]) for obj in objs])
+
+    def test_list_serializer_class(self):
+        serializer = TestModelSerializer(TestModel.objects.all(), many=True)
+        self.assertIsInstance(serializer, serializers.TaggitListSerializer)
+
+    def test_queryset_queries(self):
+        # the objects, then their tags
+        with self.assertNumQueries(2):
+            data = TestModelSerializer(TestModel.objects.all(), many=True).data
+        self.assertEqual(len(data), 1000)
+        self.assertEqual(sorted(data[0]["tags"]), sorted(["a", "c", "1"]))
+
+    def test_prefetched_queryset_queries(self):
+        objs = TestModel.objects.prefetch_related("tags")
+        with self.assertNumQueries(2):
+            data = TestModelSerializer(objs, many=True).data
+        self.assertEqual(len(data), 1000)
+
+    def test_list_queries(self):
+        objs = list(TestModel.objects.all()[:10])
+        with self.assertNumQueries(1):
+            data = TestModelSerializer(objs, many=True).data
+        self.assertEqual(len(data), 10)
+
+    def test_ordered_field_queries(self):
+        with self.assertNumQueries(2):
+            data = OrderedTestModelSerializer(TestModel.objects.all(), many=True).data
+        for item in data:
+            self.assertEqual(item["tags"], sorted(item["tags"], reverse=True))
+
+    def test_ordered_field_without_prefetch(self):
+        obj = TestModel.objects.first()
+        with self.assertNumQueries(1):
+            data = OrderedTestModelSerializer(obj).data
+        self.assertEqual(data["tags"][:2], ["c", "a"])
+
+    def test_ordered_field_with_nullable_and_relational_fields(self):
+        food = DirectTrackedFood.objects.create(name="apple")
+        food.tags.add(
+            TrackedTag.objects.create(name="green", slug="green"),
+            TrackedTag.objects.create(name="red", slug="red", description="ripe"),
+            through_defaults={"created_by": "test"},
+        )
+        food = DirectTrackedFood.objects.prefetch_related("tags").get()
+        for order_by, expected in [
+            (["-description", "name"], ["red", "green"]),
+            (["taggedtrackedfood_items", "name"], ["green", "red"]),
+        ]:
+            field = serializers.TagListSerializerField()
+            field.order_by = order_by
+            with self.assertNumQueries(1):
+                self.assertEqual(list(field.to_representation(food.tags)), expected)
+
+    def test_custom_list_serializer_class(self):
+        class CustomListSerializer(rest_framework_serializers.ListSerializer):
+            pass
+
+        class CustomSerializer(TestModelSerializer):
+            class Meta(TestModelSerializer.Meta):
+                list_serializer_class = CustomListSerializer
+
+        serializer = CustomSerializer(TestModel.objects.all(), many=True)
+        self.assertIs(type(serializer), CustomListSerializer)
+
+    def test_plain_serializer_over_dicts(self):
+        class PlainSerializer(
+            serializers.TaggitSerializer, rest_framework_serializers.Serializer
+        ):
+            name = rest_framework_serializers.CharField()
+            tags = serializers.TagListSerializerField()
+
+        items = [
+            {"name": "apple", "tags": ["green", "red"]},
+            {"name": "pear", "tags": []},
+        ]
+        with self.assertNumQueries(0):
+            data = PlainSerializer(items, many=True).data
+        self.assertEqual(data[0]["tags"], ["green", "red"])
+        self.assertEqual(data[1]["name"], "pear")
+
+    def test_list_serializer_kwargs(self):
+        serializer = TestModelSerializer(
+            TestModel.objects.all(), many=True, allow_empty=False, read_only=True
+        )
+        self.assertIsInstance(serializer.child, TestModelSerializer)
+        self.assertFalse(serializer.allow_empty)
+        self.assertTrue(serializer.read_only)
+
+    def create_many(self, count):
+        data = [{"tags": ["new", "a", str(i)]} for i in range(count)]
+        serializer = TestModelSerializer(data=data, many=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        with CaptureQueriesContext(connection) as queries:
+            objs = serializer.save()
+        return objs, len(queries)
+
+    def test_create_many(self):
+        objs, _queries = self.create_many(5)
+        self.assertEqual(len(objs), 5)
+        for i, obj in enumerate(objs):
+            self.assertEqual(
+                sorted(obj.tags.values_list("name", flat=True)),
+                sorted(["a", str(i), "new"]),
+            )
+
+    def test_create_many_with_custom_create(self):
+        class CustomSerializer(TestModelSerializer):
+            def create(self, validated_data):
+                validated_data["tags"] = validated_data["tags"] + ["custom"]
+                return super().create(validated_data)
+
+        serializer = CustomSerializer(data=[{"tags": ["a"]}, {"tags": []}], many=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        objs = serializer.save()
+        for obj, expected in zip(objs, [["a", "custom"], ["custom"]]):
+            self.assertEqual(sorted(obj.tags.names()), expected)
+
+    def test_create_many_with_custom_save_tags(self):
+        class CustomSerializer(TestModelSerializer):
+            def _save_tags(self, tag_object, tags):
+                tags["tags"] = [tag.upper() for tag in tags["tags"]]
+                return super()._save_tags(tag_object, tags)
+
+        serializer = CustomSerializer(data=[{"tags": ["a", "b"]}], many=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        (obj,) = serializer.save()
+        self.assertEqual(sorted(obj.tags.names()), ["A", "B"])
+
+    def test_create_many_queries(self):
+        _objs, queries = self.create_many(10)
+        _objs, more_queries = self.create_many(50)
+        # one INSERT per object, the tags take the same number of queries
+        self.assertEqual(more_queries - queries, 40)
+
+
+class TagListTests(SimpleTestCase):
+    def test_getitem(self):
+        tags = serializers.TagList(["b", "a", "c"], pretty_print=False)
+        self.assertEqual(tags[0], "b")
+        self.assertIs(type(tags[0]), str)
+        self.assertEqual(tags[1:], ["a", "c"])
+        self.assertIsInstance(tags[1:], serializers.TagList)
+        self.assertFalse(tags[1:].pretty_print)
+
+    def test_add(self):
+        tags = serializers.TagList(["b"], pretty_print=False) + ["a"]
+        self.assertEqual(tags, ["b", "a"])
+        self.assertIsInstance(tags, serializers.TagList)
+        self.assertFalse(tags.pretty_print)
+        with self.assertRaises(TypeError):
+            serializers.TagList(["b"]) + "a"
+
+    def test_str(self):
+        self.assertEqual(
+            str(serializers.TagList(["b", "a"])), '[\n    "b",\n    "a"\n]'
+        )
+        self.assertEqual(
+            str(serializers.TagList(["b", "a"], pretty_print=False)), '["b", "a"]'
+        )
+
+    def test_pickle(self):
+        tags = pickle.loads(
+            pickle.dumps(serializers.TagList(["b", "a"], pretty_print=False))
+        )
+        self.assertEqual(tags, ["b", "a"])
+        self.assertFalse(tags.pretty_print)
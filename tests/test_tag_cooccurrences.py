@@ -0,0 +1,100 @@
+from io import StringIO
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from taggit.models import Tag, TagCooccurrence, merge_tags
+from tests.models import DirectFood, Food, Pet
+
+
+@override_settings(TAGGIT_TRACK_TAG_COOCCURRENCES=True)
+class TagCooccurrenceTests(TestCase):
+    def assertRelated(self, name, expected, **kwargs):
+        tag = Tag.objects.get(name=name)
+        self.assertEqual(
+            [(t.name, t.num_times) for t in Tag.objects.related_tags(tag, **kwargs)],
+            expected,
+        )
+
+    def assertCooccurrencesAreRebuilt(self):
+        fields = ("tag", "other_tag", "through", "content_type", "count")
+        cooccurrences = set(TagCooccurrence.objects.values_list(*fields))
+        call_command("rebuild_tag_counts", stdout=StringIO())
+        rebuilt = set(TagCooccurrence.objects.values_list(*fields))
+        self.assertEqual({c for c in cooccurrences if c[-1]}, rebuilt)
+
+    def test_add_remove_clear(self):
+        apple = Food.objects.create(name="apple")
+        pear = Food.objects.create(name="pear")
+        apple.tags.add("green", "red")
+        apple.tags.add("sweet")
+        pear.tags.add("green", "sweet")
+        self.assertRelated("green", [("sweet", 2), ("red", 1)])
+        self.assertRelated("red", [("green", 1), ("sweet", 1)])
+
+        apple.tags.remove("sweet")
+        self.assertRelated("green", [("red", 1), ("sweet", 1)])
+        self.assertRelated("red", [("green", 1)])
+
+        apple.tags.clear()
+        self.assertRelated("green", [("sweet", 1)])
+        self.assertRelated("red", [])
+        self.assertCooccurrencesAreRebuilt()
+
+    def test_set_and_bulk_methods(self):
+        apple = Food.objects.create(name="apple")
+        pear = Food.objects.create(name="pear")
+        apple.tags.set(["green", "red"])
+        apple.tags.set(["green", "sweet"])
+        Food.tags.bulk_add([(pear, ["green", "sour"]), (apple, ["sour"])])
+        self.assertRelated("green", [("sour", 2), ("sweet", 1)])
+
+        Food.tags.bulk_set([(apple, ["green"]), (pear, ["green", "sweet"])])
+        self.assertRelated("green", [("sweet", 1)])
+        self.assertCooccurrencesAreRebuilt()
+
+    def test_limit_and_content_type(self):
+        apple = Food.objects.create(name="apple")
+        apple.tags.add("green", "red", "sweet")
+        Pet.objects.create(name="frog").tags.add("green", "sweet")
+        self.assertRelated("green", [("sweet", 2)], limit=1)
+        self.assertRelated("green", [("sweet", 1)], content_type=Pet)
+
+    def test_direct_through_model(self):
+        DirectFood.objects.create(name="apple").tags.add("green", "red")
+        DirectFood.objects.create(name="pear").tags.add("green", "red")
+        self.assertRelated("green", [("red", 2)])
+        self.assertCooccurrencesAreRebuilt()
+
+    def test_delete_object(self):
+        apple = Food.objects.create(name="apple")
+        pear = Food.objects.create(name="pear")
+        apple.tags.add("green", "red", "sweet")
+        pear.tags.add("green", "sweet")
+        apple.delete()
+        self.assertRelated("green", [("sweet", 1)])
+        self.assertRelated("red", [])
+
+        DirectFood.objects.create(name="kiwi").tags.add("green", "red")
+        DirectFood.objects.all().delete()
+        self.assertRelated("green", [("sweet", 1)])
+        self.assertCooccurrencesAreRebuilt()
+
+    def test_merge_tags(self):
+        apple = Food.objects.create(name="apple")
+        pear = Food.objects.create(name="pear")
+        apple.tags.add("green", "lime", "sweet")
+        pear.tags.add("lime", "sour")
+        DirectFood.objects.create(name="kiwi").tags.add("lime", "sour")
+        merge_tags([Tag.objects.get(name="lime")], Tag.objects.get(name="green"))
+        self.assertRelated("green", [("sour", 2), ("sweet", 1)])
+        self.assertRelated("sweet", [("green", 1)])
+        self.assertCooccurrencesAreRebuilt()
+
+    @override_settings(TAGGIT_TRACK_TAG_COOCCURRENCES=False)
+    def test_not_tracked_by_default(self):
+        Food.objects.create(name="apple").tags.add("green", "red")
+        self.assertFalse(TagCooccurrence.objects.exists())
+        with self.assertRaises(ImproperlyConfigured):
+            Tag.objects.related_tags(Tag.objects.get(name="green"))
@@ -0,0 +1,184 @@
+from io import StringIO
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from taggit.models import Tag, TagCount, TaggedItem, merge_tags
+from tests.models import DirectFood, DirectHousePet, DirectPet, Food, HousePet, Pet
+
+
+@override_settings(TAGGIT_TRACK_TAG_COUNTS=True)
+class TagCountTests(TestCase):
+    def assertMostCommon(self, model, expected, **kwargs):
+        self.assertEqual(
+            [(t.name, t.num_times) for t in model.tags.most_common(**kwargs)],
+            expected,
+        )
+
+    def assertCountsAreRebuilt(self):
+        counts = set(TagCount.objects.values_list("tag", "content_type", "count"))
+        call_command("rebuild_tag_counts", stdout=StringIO())
+        rebuilt = set(TagCount.objects.values_list("tag", "content_type", "count"))
+        self.assertEqual({c for c in counts if c[2]}, rebuilt)
+
+    def test_add_remove_clear(self):
+        apple = Food.objects.create(name="apple")
+        pear = Food.objects.create(name="pear")
+        apple.tags.add("green", "red")
+        pear.tags.add("green")
+        Pet.objects.create(name="kitty").tags.add("red")
+        self.assertMostCommon(Food, [("green", 2), ("red", 1)])
+        self.assertMostCommon(Pet, [("red", 1)])
+
+        apple.tags.remove("green")
+        self.assertMostCommon(Food, [("green", 1), ("red", 1)])
+
+        apple.tags.clear()
+        self.assertMostCommon(Food, [("green", 1)])
+        self.assertCountsAreRebuilt()
+
+    def test_set(self):
+        apple = Food.objects.create(name="apple")
+        apple.tags.set(["green", "red"])
+        apple.tags.set(["green", "yellow"])
+        self.assertEqual(
+            sorted((t.name, t.num_times) for t in Food.tags.most_common()),
+            [("green", 1), ("yellow", 1)],
+        )
+        self.assertCountsAreRebuilt()
+
+    def test_add_existing_tags_is_not_counted_twice(self):
+        apple = Food.objects.create(name="apple")
+        apple.tags.add("green")
+        apple.tags.add("green")
+        self.assertMostCommon(Food, [("green", 1)])
+
+    def test_bulk_methods(self):
+        apple = Food.objects.create(name="apple")
+        pear = Food.objects.create(name="pear")
+        kitty = HousePet.objects.create(name="kitty")
+        Food.tags.bulk_add([(apple, ["green", "red"]), (pear, ["green"])])
+        Pet.tags.bulk_add([(kitty, ["green"])])
+        self.assertMostCommon(Food, [("green", 2), ("red", 1)])
+        self.assertMostCommon(HousePet, [("green", 1)])
+        self.assertMostCommon(Pet, [])
+
+        Food.tags.bulk_set([(apple, ["red"]), (pear, [])])
+        self.assertMostCommon(Food, [("red", 1)])
+        self.assertCountsAreRebuilt()
+
+    def test_min_count(self):
+        apple = Food.objects.create(name="apple")
+        pear = Food.objects.create(name="pear")
+        apple.tags.add("green", "red")
+        pear.tags.add("green")
+        self.assertMostCommon(Food, [("green", 2)], min_count=2)
+
+    def test_direct_through_model(self):
+        apple = DirectFood.objects.create(name="apple")
+        apple.tags.add("green")
+        DirectPet.objects.create(name="kitty").tags.add("green")
+        DirectHousePet.objects.create(name="tiger").tags.add("green", "red")
+        self.assertMostCommon(DirectFood, [("green", 1)])
+        self.assertMostCommon(DirectPet, [("green", 2), ("red", 1)])
+        self.assertCountsAreRebuilt()
+
+    def test_delete_object(self):
+        apple = Food.objects.create(name="apple")
+        pear = Food.objects.create(name="pear")
+        apple.tags.add("green", "red")
+        pear.tags.add("red")
+        apple.delete()
+        self.assertMostCommon(Food, [("red", 1)])
+
+        Food.objects.create(name="kiwi").tags.add("red")
+        Food.objects.all().delete()
+        self.assertMostCommon(Food, [])
+        self.assertCountsAreRebuilt()
+
+    def test_delete_object_direct_through_model(self):
+        apple = DirectFood.objects.create(name="apple")
+        apple.tags.add("green", "red")
+        DirectFood.objects.create(name="pear").tags.add("red")
+        apple.delete()
+        self.assertMostCommon(DirectFood, [("red", 1)])
+        self.assertCountsAreRebuilt()
+
+    def test_merge_tags(self):
+        apple = Food.objects.create(name="apple")
+        pear = Food.objects.create(name="pear")
+        apple.tags.add("green", "lime")
+        pear.tags.add("lime", "olive")
+        DirectFood.objects.create(name="kiwi").tags.add("lime")
+        merge_tags(
+            Tag.objects.filter(name__in=["lime", "olive"]),
+            Tag.objects.get(name="green"),
+        )
+        self.assertMostCommon(Food, [("green", 2)])
+        self.assertMostCommon(DirectFood, [("green", 1)])
+        self.assertCountsAreRebuilt()
+
+    @override_settings(TAGGIT_CASE_INSENSITIVE=True)
+    def test_deduplicate_tags(self):
+        apple = Food.objects.create(name="apple")
+        apple.tags.add("green")
+        Food.objects.create(name="pear").tags.add(
+            Tag.objects.create(name="Green", slug="green-1")
+        )
+        apple.tags.add(Tag.objects.get(name="Green"))
+        call_command("deduplicate_tags", stdout=StringIO())
+        self.assertMostCommon(Food, [("green", 2)])
+        self.assertCountsAreRebuilt()
+
+    def test_most_common_queries(self):
+        apple = Food.objects.create(name="apple")
+        apple.tags.add("green", "red")
+        with self.assertNumQueries(1):
+            list(Food.tags.most_common())
+
+    def test_matches_uncounted_most_common(self):
+        apple = Food.objects.create(name="apple")
+        pear = Food.objects.create(name="pear")
+        apple.tags.add("green", "red")
+        pear.tags.add("green", "yellow")
+        with self.settings(TAGGIT_TRACK_TAG_COUNTS=False):
+            expected = {(t.name, t.num_times) for t in Food.tags.most_common()}
+        self.assertEqual(
+            {(t.name, t.num_times) for t in Food.tags.most_common()}, expected
+        )
+
+    def test_extra_filters_use_the_through_table(self):
+        apple = Food.objects.create(name="apple")
+        apple.tags.add("green", "red")
+        self.assertEqual(
+            [
+                t.name
+                for t in Food.tags.most_common(extra_filters={"name__startswith": "g"})
+            ],
+            ["green"],
+        )
+
+    def test_rebuild(self):
+        apple = Food.objects.create(name="apple")
+        apple.tags.add("green", "red")
+        # rows created behind the manager's back
+        TaggedItem.objects.create(
+            tag=Tag.objects.create(name="yellow"),
+            content_type=ContentType.objects.get_for_model(Food),
+            object_id=apple.pk,
+        )
+        TagCount.objects.filter(tag__name="green").update(count=10)
+
+        out = StringIO()
+        call_command("rebuild_tag_counts", stdout=out)
+        self.assertIn("Rebuilt the counts of taggit.TagCount.", out.getvalue())
+        self.assertEqual(
+            sorted((t.name, t.num_times) for t in Food.tags.most_common()),
+            [("green", 1), ("red", 1), ("yellow", 1)],
+        )
+
+    @override_settings(TAGGIT_TRACK_TAG_COUNTS=False)
+    def test_not_tracked_by_default(self):
+        Food.objects.create(name="apple").tags.add("green")
+        self.assertFalse(TagCount.objects.exists())
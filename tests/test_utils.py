@@ -1,10 +1,91 @@
 import os
 import os.path
+import random
+from unittest import mock
 
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase, override_settings
 from django.utils import translation
 
-from taggit.utils import split_strip
+from taggit.utils import _parse_tags, get_func, parse_tags, split_strip
+from tests.custom_parser import comma_splitter
+
+
+def character_parse_tags(tagstring):
+    """
+    The previous, character by character, implementation of ``_parse_tags``.
+    """
+    if not tagstring:
+        return []
+
+    if "," not in tagstring and '"' not in tagstring:
+        words = list(set(split_strip(tagstring, " ")))
+        words.sort()
+        return words
+
+    words = []
+    buffer = []
+    to_be_split = []
+    saw_loose_comma = False
+    open_quote = False
+    i = iter(tagstring)
+    try:
+        while True:
+            c = next(i)
+            if c == '"':
+                if buffer:
+                    to_be_split.append("".join(buffer))
+                    buffer = []
+                open_quote = True
+                c = next(i)
+                while c != '"':
+                    buffer.append(c)
+                    c = next(i)
+                if buffer:
+                    word = "".join(buffer).strip()
+                    if word:
+                        words.append(word)
+                    buffer = []
+                open_quote = False
+            else:
+                if not saw_loose_comma and c == ",":
+                    saw_loose_comma = True
+                buffer.append(c)
+    except StopIteration:
+        if buffer:
+            if open_quote and "," in buffer:
+                saw_loose_comma = True
+            to_be_split.append("".join(buffer))
+    if to_be_split:
+        if saw_loose_comma:
+            delimiter = ","
+        else:
+            delimiter = " "
+        for chunk in to_be_split:
+            words.extend(split_strip(chunk, delimiter))
+    words = list(set(words))
+    words.sort()
+    return words
+
+
+class ParseTagsEquivalenceTests(SimpleTestCase):
+    def test_matches_character_parser(self):
+        rng = random.Random(0)
+        # mostly delimiters, to exercise every combination of them
+        alphabet = ['"', '"', ",", ",", " ", " ", "\t", "a", "b", "c"]
+        for _i in range(5000):
+            tagstring = "".join(rng.choices(alphabet, k=rng.randint(0, 20)))
+            with self.subTest(tagstring=tagstring):
+                self.assertEqual(
+                    _parse_tags(tagstring), character_parse_tags(tagstring)
+                )
+
+    def test_long_input(self):
+        tags = ["tag %d" % i for i in range(2000)]
+        tagstring = ", ".join(
+            '"%s"' % tag if i % 3 else tag for i, tag in enumerate(tags)
+        )
+        self.assertEqual(_parse_tags(tagstring), sorted(tags))
+        self.assertEqual(_parse_tags(tagstring), character_parse_tags(tagstring))
 
 
 class SplitStripTests(TestCase):
@@ -21,6 +102,26 @@ class SplitStripTests(TestCase):
         self.assertListEqual(result, expected_result)
 
 
+class GetFuncTests(SimpleTestCase):
+    @override_settings(TAGGIT_TAGS_FROM_STRING="tests.custom_parser.comma_splitter")
+    def test_resolved_once(self):
+        with mock.patch("taggit.utils.import_string") as import_string:
+            import_string.return_value = comma_splitter
+            for _i in range(3):
+                self.assertIs(
+                    get_func("TAGGIT_TAGS_FROM_STRING", _parse_tags), comma_splitter
+                )
+        import_string.assert_called_once_with("tests.custom_parser.comma_splitter")
+
+    def test_setting_changed(self):
+        self.assertEqual(parse_tags("a b"), ["a", "b"])
+        with self.settings(
+            TAGGIT_TAGS_FROM_STRING="tests.custom_parser.comma_splitter"
+        ):
+            self.assertEqual(parse_tags("a b"), ["a b"])
+        self.assertEqual(parse_tags("a b"), ["a", "b"])
+
+
 class TestLanguages(TestCase):
     maxDiff = None
 
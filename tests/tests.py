@@ -9,10 +9,11 @@ from django.core.exceptions import ValidationError
 from django.core.management import call_command
 from django.db import IntegrityError, connection, models
 from django.test import RequestFactory, SimpleTestCase, TestCase
-from django.test.utils import override_settings
+from django.test.utils import CaptureQueriesContext, override_settings
 
-from taggit.managers import TaggableManager, _TaggableManager
-from taggit.models import Tag, TaggedItem
+from taggit.cache import clear_tag_cache
+from taggit.managers import TaggableManager, TaggableQuerySet, _TaggableManager
+from taggit.models import CommonGenericTaggedItemBase, Tag, TaggedItem
 from taggit.utils import edit_string_for_tags, parse_tags
 from taggit.views import tagged_object_list
 
@@ -44,6 +45,7 @@ from .models import (
     HousePet,
     Movie,
     MultiInheritanceFood,
+    MultipleTags,
     Name,
     OfficialFood,
     OfficialHousePet,
@@ -490,53 +492,196 @@ class TaggableManagerTestCase(BaseTaggingTestCase):
         # Prefill content type cache:
         ContentType.objects.get_for_model(self.food_model)
         apple = self.food_model.objects.create(name="apple")
-        # 1. SELECT "taggit_tag"."id", "taggit_tag"."name", "taggit_tag"."slug" FROM "taggit_tag" WHERE "taggit_tag"."name" IN ('green', 'red', 'delicious')
-        # 2. SELECT "taggit_tag"."id", "taggit_tag"."name", "taggit_tag"."slug" FROM "taggit_tag" WHERE "taggit_tag"."name" = 'green'
-        # 3. SAVEPOINT
-        # 4. SAVEPOINT
-        # 5. INSERT INTO "taggit_tag" ("name", "slug") VALUES ('green', 'green')
-        # 6. RELEASE SAVEPOINT
-        # 7. RELEASE SAVEPOINT
-        # 8. SELECT "taggit_tag"."id", "taggit_tag"."name", "taggit_tag"."slug" FROM "taggit_tag" WHERE "taggit_tag"."name" = 'red'
-        # 9. SAVEPOINT
-        # 10. SAVEPOINT
-        # 11. INSERT INTO "taggit_tag" ("name", "slug") VALUES ('red', 'red')
-        # 12. RELEASE SAVEPOINT
-        # 13. RELEASE SAVEPOINT
-        # 14. SELECT "taggit_tag"."id", "taggit_tag"."name", "taggit_tag"."slug" FROM "taggit_tag" WHERE "taggit_tag"."name" = 'delicious'
-        # 15. SAVEPOINT
-        # 16. SAVEPOINT
-        # 17. INSERT INTO "taggit_tag" ("name", "slug") VALUES ('delicious', 'delicious')
-        # 18. RELEASE SAVEPOINT
-        # 19. RELEASE SAVEPOINT
-        # 20. SELECT "taggit_taggeditem"."tag_id" FROM "taggit_taggeditem" WHERE ("taggit_taggeditem"."content_type_id" = 20 AND "taggit_taggeditem"."object_id" = 1)
-        # 21. SELECT "taggit_taggeditem"."id", "taggit_taggeditem"."tag_id", "taggit_taggeditem"."content_type_id", "taggit_taggeditem"."object_id" FROM "taggit_taggeditem" WHERE ("taggit_taggeditem"."content_type_id" = 20 AND "taggit_taggeditem"."object_id" = 1 AND "taggit_taggeditem"."tag_id" = 1)
-        # 22. SAVEPOINT
-        # 23. INSERT INTO "taggit_taggeditem" ("tag_id", "content_type_id", "object_id") VALUES (1, 20, 1)
-        # 24. RELEASE SAVEPOINT
-        # 25. SELECT "taggit_taggeditem"."id", "taggit_taggeditem"."tag_id", "taggit_taggeditem"."content_type_id", "taggit_taggeditem"."object_id" FROM "taggit_taggeditem" WHERE ("taggit_taggeditem"."content_type_id" = 20 AND "taggit_taggeditem"."object_id" = 1 AND "taggit_taggeditem"."tag_id" = 2)
-        # 26. SAVEPOINT
-        # 27. INSERT INTO "taggit_taggeditem" ("tag_id", "content_type_id", "object_id") VALUES (2, 20, 1)
-        # 28. RELEASE SAVEPOINT
-        # 29. SELECT "taggit_taggeditem"."id", "taggit_taggeditem"."tag_id", "taggit_taggeditem"."content_type_id", "taggit_taggeditem"."object_id" FROM "taggit_taggeditem" WHERE ("taggit_taggeditem"."content_type_id" = 20 AND "taggit_taggeditem"."object_id" = 1 AND "taggit_taggeditem"."tag_id" = 3)
-        # 30. SAVEPOINT
-        # 31. INSERT INTO "taggit_taggeditem" ("tag_id", "content_type_id", "object_id") VALUES (3, 20, 1)
-        # 32. RELEASE SAVEPOINT
-        queries = 32
+        # 1. SELECT "taggit_tag"."id", "taggit_tag"."name", "taggit_tag"."slug" FROM "taggit_tag" WHERE "taggit_tag"."name" IN ('red', 'delicious', 'green')
+        # 2. INSERT OR IGNORE INTO "taggit_tag" ("name", "slug") VALUES ('red', 'red'), ('delicious', 'delicious'), ('green', 'green')
+        # 3. SELECT "taggit_tag"."id", "taggit_tag"."name", "taggit_tag"."slug" FROM "taggit_tag" WHERE "taggit_tag"."name" IN ('red', 'delicious', 'green')
+        # 4. SELECT "taggit_taggeditem"."tag_id" FROM "taggit_taggeditem" WHERE ("taggit_taggeditem"."content_type_id" = 20 AND "taggit_taggeditem"."object_id" = 1)
+        # 5. INSERT OR IGNORE INTO "taggit_taggeditem" ("tag_id", "content_type_id", "object_id") VALUES (1, 20, 1), (2, 20, 1), (3, 20, 1)
+        queries = 5
         self.assertNumQueries(queries, apple.tags.add, "red", "delicious", "green")
 
         pear = self.food_model.objects.create(name="pear")
         #   1 query to see which tags exist
         #   1  query to check existing ids for sending m2m_changed signal
-        # + 4 queries to create the intermediary things (including SELECTs, to
-        #     make sure we dont't double create.
-        # + 4 for save points.
-        queries = 10
+        # + 1 query to create the intermediary things
+        queries = 3
         self.assertNumQueries(queries, pear.tags.add, "green", "delicious")
 
         #   1  query to check existing ids for sending m2m_changed signal
         self.assertNumQueries(1, pear.tags.add)
 
+    def test_add_new_tags_with_conflicting_slugs(self):
+        self.tag_model.objects.create(name="Red!")
+        apple = self.food_model.objects.create(name="apple")
+        apple.tags.add("red", "RED", "green")
+        self.assert_tags_equal(apple.tags.all(), ["RED", "green", "red"])
+        self.assert_tags_equal(
+            self.tag_model.objects.all(),
+            ["green", "red", "red_1", "red_2"],
+            attr="slug",
+        )
+
+    @mock.patch("taggit.managers._can_bulk_insert", return_value=False)
+    def test_add_new_tags_without_bulk_insert(self, can_bulk_insert_mock):
+        apple = self.food_model.objects.create(name="apple")
+        apple.tags.add("red", "RED", "green")
+        self.assert_tags_equal(apple.tags.all(), ["RED", "green", "red"])
+        self.assert_tags_equal(
+            self.tag_model.objects.all(), ["green", "red", "red_1"], attr="slug"
+        )
+
+    def test_add_existing_tags_queries(self):
+        apple = self.food_model.objects.create(name="apple")
+        apple.tags.add("red", "green")
+        # 1 query to see which tags exist and 1 to check the existing ids,
+        # nothing to insert
+        self.assertNumQueries(2, apple.tags.add, "red", "green")
+        self.assertEqual(self.taggeditem_model.objects.count(), 2)
+
+    @mock.patch("taggit.managers._can_bulk_insert", return_value=False)
+    def test_add_tags_without_bulk_insert(self, can_bulk_insert_mock):
+        apple = self.food_model.objects.create(name="apple")
+        apple.tags.add("red", "green")
+        apple.tags.add("red", "yellow")
+        self.assert_tags_equal(apple.tags.all(), ["green", "red", "yellow"])
+        self.assertEqual(self.taggeditem_model.objects.count(), 3)
+
+    def test_add_sends_through_save_signals(self):
+        apple = self.food_model.objects.create(name="apple")
+        receiver = mock.Mock()
+        models.signals.post_save.connect(receiver, sender=self.taggeditem_model)
+        self.addCleanup(
+            models.signals.post_save.disconnect, receiver, sender=self.taggeditem_model
+        )
+        apple.tags.add("red", "green")
+        apple.tags.add("red", "yellow")
+        self.assertEqual(receiver.call_count, 3)
+        self.assertEqual(
+            sorted(
+                call.kwargs["instance"].tag.name for call in receiver.call_args_list
+            ),
+            ["green", "red", "yellow"],
+        )
+        self.assertTrue(all(call.kwargs["created"] for call in receiver.call_args_list))
+
+    def test_set_queries(self):
+        ContentType.objects.get_for_model(self.food_model)
+        apple = self.food_model.objects.create(name="apple")
+        apple.tags.add(*["tag %d" % i for i in range(20)])
+        for i in range(20, 40):
+            self.tag_model.objects.create(name="tag %d" % i)
+        # 1 query to fetch the tags, 1 to read the existing rows, 1 to delete
+        # the removed ones and 1 to insert the new ones
+        with self.assertNumQueries(4):
+            apple.tags.set(["tag %d" % i for i in range(10, 40)])
+        self.assert_tags_equal(apple.tags.all(), ["tag %d" % i for i in range(10, 40)])
+
+    def test_set_same_tags_queries(self):
+        apple = self.food_model.objects.create(name="apple")
+        apple.tags.add("red", "green")
+        # 1 query to fetch the tags and 1 to read the existing rows
+        with self.assertNumQueries(2):
+            apple.tags.set(["green", "red"])
+        self.assert_tags_equal(apple.tags.all(), ["green", "red"])
+
+    def test_bulk_add(self):
+        apple = self.food_model.objects.create(name="apple")
+        pear = self.food_model.objects.create(name="pear")
+        apple.tags.add("red")
+        self.food_model.tags.bulk_add(
+            [(apple, ["red", "green"]), (pear, ["green", "yellow"])]
+        )
+        self.assert_tags_equal(apple.tags.all(), ["green", "red"])
+        self.assert_tags_equal(pear.tags.all(), ["green", "yellow"])
+
+    def test_bulk_add_queries(self):
+        ContentType.objects.get_for_model(self.food_model)
+        foods = [self.food_model.objects.create(name="food %d" % i) for i in range(10)]
+        # 1 query to see which tags exist, 2 to create and fetch the missing
+        # ones, 1 to get the existing through rows and 1 to insert the new ones
+        with self.assertNumQueries(5):
+            self.food_model.tags.bulk_add(
+                [(food, ["tag %d" % i, "shared"]) for i, food in enumerate(foods)]
+            )
+        self.assertEqual(self.taggeditem_model.objects.count(), 20)
+        self.assertEqual(
+            self.food_model.objects.filter(tags__name="shared").count(), 10
+        )
+
+    def test_bulk_add_across_subclasses(self):
+        kitty = self.pet_model.objects.create(name="kitty")
+        cat = self.housepet_model.objects.create(name="cat", trained=True)
+        self.pet_model.tags.bulk_add([(kitty, ["fuzzy"]), (cat, ["fuzzy", "trained"])])
+        self.assert_tags_equal(kitty.tags.all(), ["fuzzy"])
+        self.assert_tags_equal(cat.tags.all(), ["fuzzy", "trained"])
+
+    def test_bulk_add_batch_size(self):
+        foods = [self.food_model.objects.create(name="food %d" % i) for i in range(5)]
+        self.food_model.tags.bulk_add(
+            ((food, ["green"]) for food in foods), batch_size=2
+        )
+        self.assertEqual(self.food_model.objects.filter(tags__name="green").count(), 5)
+
+    @mock.patch("django.db.models.signals.m2m_changed.send")
+    def test_bulk_methods_reject_unsaved_objects(self, send_mock):
+        apple = self.food_model.objects.create(name="apple")
+        unsaved = self.food_model(name="pear")
+        # custom primary keys may have a default
+        unsaved.pk = None
+        for method in (self.food_model.tags.bulk_add, self.food_model.tags.bulk_set):
+            with self.assertNumQueries(0), self.assertRaises(ValueError):
+                method([(apple, ["green"]), (unsaved, ["green"])])
+        self.assertFalse(send_mock.called)
+        self.assertFalse(self.tag_model.objects.exists())
+
+    def test_bulk_set(self):
+        apple = self.food_model.objects.create(name="apple")
+        pear = self.food_model.objects.create(name="pear")
+        apple.tags.add("red", "green")
+        pear.tags.add("green")
+        self.food_model.tags.bulk_set(
+            [(apple, ["green", "juicy"]), (pear, []), (apple, ["sour"])]
+        )
+        self.assert_tags_equal(apple.tags.all(), ["green", "juicy", "sour"])
+        self.assert_tags_equal(pear.tags.all(), [])
+
+    def test_bulk_set_removes_prefetched_tags(self):
+        apple = self.food_model.objects.create(name="apple")
+        apple.tags.add("red")
+        apple = self.food_model.objects.prefetch_related("tags").get(pk=apple.pk)
+        self.food_model.tags.bulk_set([(apple, ["green"])])
+        self.assert_tags_equal(apple.tags.all(), ["green"])
+
+    @mock.patch("django.db.models.signals.m2m_changed.send")
+    def test_bulk_set_sends_m2m_changed_signals(self, send_mock):
+        apple = self.food_model.objects.create(name="apple")
+        apple.tags.add("green")
+        green_pk = self.tag_model.objects.get(name="green").pk
+        send_mock.reset_mock()
+
+        self.food_model.tags.bulk_set([(apple, ["red"])])
+        red_pk = self.tag_model.objects.get(name="red").pk
+
+        self.assertEqual(
+            [
+                (c.kwargs["action"], c.kwargs["instance"], c.kwargs["pk_set"])
+                for c in send_mock.call_args_list
+            ],
+            [
+                ("pre_remove", apple, {green_pk}),
+                ("post_remove", apple, {green_pk}),
+                ("pre_add", apple, {red_pk}),
+                ("post_add", apple, {red_pk}),
+            ],
+        )
+
+    @mock.patch("django.db.models.signals.m2m_changed.send")
+    def test_bulk_add_without_signals(self, send_mock):
+        apple = self.food_model.objects.create(name="apple")
+        self.food_model.tags.bulk_add([(apple, ["red"])], send_signals=False)
+        self.assertEqual(send_mock.call_count, 0)
+        self.assert_tags_equal(apple.tags.all(), ["red"])
+
     def test_require_pk(self):
         food_instance = self.food_model()
         msg = (
@@ -651,6 +796,160 @@ class TaggableManagerTestCase(BaseTaggingTestCase):
         self.assertEqual(similar_objs, [pear, watermelon])
         self.assertEqual([obj.similar_tags for obj in similar_objs], [3, 2])
 
+    def test_similar_objects_limit_and_min_shared(self):
+        apple = self.food_model.objects.create(name="apple")
+        apple.tags.add("green", "juicy", "small", "sour")
+        pear = self.food_model.objects.create(name="pear")
+        pear.tags.add("green", "juicy", "small", "sweet")
+        watermelon = self.food_model.objects.create(name="watermelon")
+        watermelon.tags.add("green", "juicy", "large", "sweet")
+        lime = self.food_model.objects.create(name="lime")
+        lime.tags.add("green", "tiny")
+
+        self.assertEqual(apple.tags.similar_objects(limit=1), [pear])
+        self.assertEqual(apple.tags.similar_objects(min_shared=3), [pear])
+        self.assertEqual(apple.tags.similar_objects(min_shared=2), [pear, watermelon])
+        self.assertEqual(apple.tags.similar_objects(limit=10), [pear, watermelon, lime])
+        self.assertEqual(apple.tags.similar_objects(min_shared=5), [])
+
+    def test_similar_objects_methods(self):
+        apple = self.food_model.objects.create(name="apple")
+        apple.tags.add("green", "juicy", "small", "sour")
+        pear = self.food_model.objects.create(name="pear")
+        pear.tags.add("green", "juicy", "small", "sweet")
+        watermelon = self.food_model.objects.create(name="watermelon")
+        watermelon.tags.add(
+            "green", "juicy", "large", "sweet", "round", "heavy", "striped"
+        )
+        lime = self.food_model.objects.create(name="lime")
+        lime.tags.add("green")
+
+        self.assertEqual(apple.tags.similar_objects(), [pear, watermelon, lime])
+
+        similar_objs = apple.tags.similar_objects(method="jaccard")
+        self.assertEqual(similar_objs, [pear, lime, watermelon])
+        self.assertEqual([obj.similar_tags for obj in similar_objs], [3, 1, 2])
+        for obj, expected in zip(similar_objs, [3 / 5, 1 / 4, 2 / 9]):
+            self.assertAlmostEqual(obj.similarity, expected)
+
+        similar_objs = apple.tags.similar_objects(method="cosine", limit=2)
+        self.assertEqual(similar_objs, [pear, lime])
+        for obj, expected in zip(similar_objs, [3 / 4, 1 / 2]):
+            self.assertAlmostEqual(obj.similarity, expected)
+
+        with self.assertRaises(ValueError):
+            apple.tags.similar_objects(method="euclidean")
+
+    def test_similar_objects_queries(self):
+        apple = self.food_model.objects.create(name="apple")
+        apple.tags.add("green", "juicy")
+        for name in ["pear", "watermelon", "lime"]:
+            self.food_model.objects.create(name=name).tags.add("green")
+
+        # rank the objects, then load them
+        with self.assertNumQueries(2):
+            self.assertEqual(len(apple.tags.similar_objects()), 3)
+        with self.assertNumQueries(2):
+            self.assertEqual(len(apple.tags.similar_objects(method="jaccard")), 3)
+
+    def test_similar_objects_content_types(self):
+        apple = self.food_model.objects.create(name="apple")
+        apple.tags.add("green", "juicy")
+        pear = self.food_model.objects.create(name="pear")
+        pear.tags.add("green")
+
+        if not issubclass(self.food_model.tags.through, CommonGenericTaggedItemBase):
+            with self.assertRaises(ValueError):
+                apple.tags.similar_objects(content_types=[self.food_model])
+            return
+
+        frog = self.pet_model.objects.create(name="frog")
+        frog.tags.add("green", "juicy")
+        self.assertEqual(apple.tags.similar_objects(), [frog, pear])
+        self.assertEqual(
+            apple.tags.similar_objects(content_types=[self.food_model]), [pear]
+        )
+        self.assertEqual(
+            apple.tags.similar_objects(
+                content_types=[ContentType.objects.get_for_model(self.pet_model)]
+            ),
+            [frog],
+        )
+
+    def test_tagged_with_all(self):
+        apple = self.food_model.objects.create(name="apple")
+        apple.tags.add("green", "juicy", "sour")
+        pear = self.food_model.objects.create(name="pear")
+        pear.tags.add("green", "juicy")
+        self.food_model.objects.create(name="plum").tags.add("red")
+
+        self.assertCountEqual(
+            self.food_model.objects.tagged_with_all(["green", "juicy"]), [apple, pear]
+        )
+        self.assertCountEqual(
+            self.food_model.objects.tagged_with_all(
+                ["green", self.tag_model.objects.get(name="sour")]
+            ),
+            [apple],
+        )
+        self.assertCountEqual(
+            self.food_model.objects.tagged_with_all(["green", "missing"]), []
+        )
+        self.assertCountEqual(
+            self.food_model.objects.filter(name="pear").tagged_with_all(["green"]),
+            [pear],
+        )
+
+    def test_tagged_with_any_and_without(self):
+        apple = self.food_model.objects.create(name="apple")
+        apple.tags.add("green", "sour")
+        pear = self.food_model.objects.create(name="pear")
+        pear.tags.add("green", "juicy")
+        plum = self.food_model.objects.create(name="plum")
+        plum.tags.add("red")
+        kiwi = self.food_model.objects.create(name="kiwi")
+
+        self.assertCountEqual(
+            self.food_model.objects.tagged_with_any(["sour", "juicy", "missing"]),
+            [apple, pear],
+        )
+        self.assertCountEqual(self.food_model.objects.tagged_with_any(["missing"]), [])
+        self.assertCountEqual(
+            self.food_model.objects.tagged_without(["green", "missing"]), [plum, kiwi]
+        )
+        self.assertCountEqual(
+            self.food_model.objects.tagged_without([]), [apple, pear, plum, kiwi]
+        )
+
+    def test_tagged_with_queries(self):
+        apple = self.food_model.objects.create(name="apple")
+        apple.tags.add("green", "juicy", "sour", "small", "round", "crunchy")
+        tags = ["green", "juicy", "sour", "small", "round", "crunchy"]
+
+        # resolve the tag ids, then a single query with a subquery
+        with self.assertNumQueries(2):
+            self.assertEqual(
+                list(self.food_model.objects.tagged_with_all(tags)), [apple]
+            )
+
+    def test_tagged_with_subclasses(self):
+        dog = self.pet_model.objects.create(name="dog")
+        dog.tags.add("fluffy", "loud")
+        cat = self.housepet_model.objects.create(name="cat", trained=True)
+        cat.tags.add("fluffy", "loud")
+        self.housepet_model.objects.create(name="fish").tags.add("fluffy")
+
+        pets = TaggableQuerySet(self.pet_model)
+        self.assertCountEqual(
+            [pet.name for pet in pets.tagged_with_all(["fluffy", "loud"])],
+            ["dog", "cat"],
+        )
+        housepets = TaggableQuerySet(self.housepet_model)
+        self.assertEqual(
+            [pet.name for pet in housepets.tagged_with_all(["fluffy", "loud"])],
+            ["cat"],
+        )
+
     def test_tag_reuse(self):
         apple = self.food_model.objects.create(name="apple")
         apple.tags.add("juicy", "juicy")
@@ -687,6 +986,11 @@ class TaggableManagerTestCase(BaseTaggingTestCase):
         )
         self.assertEqual(self.taggeditem_model.objects.first().extra_field, "green")
 
+        apple.tags.add("ripe", through_defaults={"extra_field": lambda: "yellow"})
+        self.assertEqual(
+            self.taggeditem_model.objects.get(tag__name="ripe").extra_field, "yellow"
+        )
+
     def test_abstract_subclasses(self):
         p = Photo.objects.create()
         p.tags.add("outdoors", "pretty")
@@ -761,6 +1065,55 @@ class TaggableManagerTestCase(BaseTaggingTestCase):
         self.assertEqual(foods["apple"], {"shared", "apple-only"})
         self.assertEqual(foods["orange"], {"shared", "orange-only"})
 
+    def test_prefetch_related_with_custom_queryset(self):
+        apple = self.food_model.objects.create(name="apple")
+        apple.tags.add("red", "green", "round")
+        orange = self.food_model.objects.create(name="orange")
+        orange.tags.add("orange", "round")
+
+        prefetch = models.Prefetch(
+            "tags",
+            queryset=self.tag_model.objects.exclude(name="round")
+            .only("name")
+            .order_by("-name"),
+        )
+        with self.assertNumQueries(2):
+            foods = list(
+                self.food_model.objects.prefetch_related(prefetch).order_by("name")
+            )
+        with self.assertNumQueries(0):
+            tags = {f.name: [t.name for t in f.tags.all()] for f in foods}
+        self.assertEqual(tags, {"apple": ["red", "green"], "orange": ["orange"]})
+
+    def test_prefetch_related_with_custom_queryset_to_attr(self):
+        apple = self.food_model.objects.create(name="apple")
+        apple.tags.add("red", "green")
+        orange = self.food_model.objects.create(name="orange")
+        orange.tags.add("orange")
+
+        prefetch = models.Prefetch(
+            "tags",
+            queryset=self.tag_model.objects.filter(name__in=["red", "orange"]),
+            to_attr="red_or_orange_tags",
+        )
+        with self.assertNumQueries(2):
+            foods = list(
+                self.food_model.objects.prefetch_related(prefetch).order_by("name")
+            )
+        self.assertEqual(
+            [[t.name for t in f.red_or_orange_tags] for f in foods],
+            [["red"], ["orange"]],
+        )
+
+    def test_instance_tags_query(self):
+        apple = self.food_model.objects.create(name="apple")
+        apple.tags.add("red")
+        with CaptureQueriesContext(connection) as captured:
+            self.assert_tags_equal(apple.tags.all(), ["red"])
+        sql = captured.captured_queries[-1]["sql"]
+        self.assertNotIn("DISTINCT", sql)
+        self.assertNotIn(ContentType._meta.db_table, sql)
+
     def test_internal_type_is_manytomany(self):
         self.assertEqual(TaggableManager().get_internal_type(), "ManyToManyField")
 
@@ -800,6 +1153,26 @@ class TaggableManagerTestCase(BaseTaggingTestCase):
         tag_names = sorted(orange.tags.names())
         self.assertEqual(tag_names, ["Spain", "Valencia"])
 
+    @override_settings(TAGGIT_CASE_INSENSITIVE=True)
+    def test_with_case_insensitive_option_picks_earliest_duplicate(self):
+        self.tag_model.objects.create(name="Spain", slug="spain")
+        self.tag_model.objects.create(name="SPAIN", slug="spain-2")
+        earliest = self.tag_model.objects.order_by("pk").first()
+        orange = self.food_model.objects.create(name="orange")
+        orange.tags.add("spain")
+        self.assertEqual(list(orange.tags.all()), [earliest])
+
+    @override_settings(TAGGIT_CASE_INSENSITIVE=True)
+    def test_with_case_insensitive_option_single_lookup_query(self):
+        names = ["Tag %d" % i for i in range(20)]
+        for name in names:
+            self.tag_model.objects.create(name=name.upper())
+        orange = self.food_model.objects.create(name="orange")
+        with self.assertNumQueries(1) as captured:
+            tags = orange.tags._to_tag_model_instances(names, {})
+        self.assertEqual([tag.name for tag in tags], [n.upper() for n in names])
+        self.assertIn("LOWER", captured.captured_queries[0]["sql"])
+
     def test_tag_uniqueness(self):
         apple = self.food_model.objects.create(name="apple")
         tag = self.tag_model.objects.create(name="juice", slug="juicy")
@@ -813,6 +1186,25 @@ class TaggableManagerTestCase(BaseTaggingTestCase):
         with self.assertNumQueries(1):
             list(qs)
 
+    def test_model_tags_lazy_with_cold_content_type_cache(self):
+        ContentType.objects.clear_cache()
+        with self.assertNumQueries(0):
+            all_tags = self.food_model.tags.all()
+            most_common = self.food_model.tags.most_common()
+        apple = self.food_model.objects.create(name="apple")
+        apple.tags.add("green", "red")
+        self.assertEqual(sorted(tag.name for tag in all_tags), ["green", "red"])
+        self.assertEqual(len(most_common), 2)
+
+    @override_settings(TAGGIT_TRACK_TAG_COUNTS=True)
+    def test_most_common_from_counts_lazy(self):
+        ContentType.objects.clear_cache()
+        with self.assertNumQueries(0):
+            qs = self.food_model.tags.most_common()
+        apple = self.food_model.objects.create(name="apple")
+        apple.tags.add("green", "red")
+        self.assertEqual(sorted(tag.name for tag in qs), ["green", "red"])
+
 
 class TaggableManagerDirectTestCase(TaggableManagerTestCase):
     food_model = DirectFood
@@ -866,6 +1258,35 @@ class TaggableManagerUUIDTestCase(TaggableManagerTestCase):
         pass
 
 
+class TaggableQuerySetTestCase(TestCase):
+    def test_tags_field(self):
+        obj = MultipleTags.objects.create()
+        obj.tags1.add("green")
+        obj.tags2.add("red")
+        queryset = TaggableQuerySet(MultipleTags)
+
+        with self.assertRaisesMessage(ValueError, "MultipleTags has 2"):
+            queryset.tagged_with_all(["green"])
+        self.assertEqual(
+            list(queryset.tagged_with_all(["green"], tags_field="tags1")), [obj]
+        )
+        self.assertEqual(
+            list(queryset.tagged_with_all(["green"], tags_field="tags2")), []
+        )
+
+    @override_settings(TAGGIT_CASE_INSENSITIVE=True)
+    def test_case_insensitive(self):
+        apple = Food.objects.create(name="apple")
+        apple.tags.add("Green", "Juicy")
+        self.assertEqual(
+            list(Food.objects.tagged_with_all(["green", "JUICY"])), [apple]
+        )
+
+    def test_invalid_tag(self):
+        with self.assertRaises(ValueError):
+            Food.objects.tagged_with_any([1])
+
+
 class TenantTagTestCase(TestCase):
     model = TenantModel
     tag_model = TenantTag
@@ -1356,6 +1777,54 @@ class TagListViewTests(TestCase):
         self.assertIn(self.apple, response.context_data["object_list"])
         self.assertNotIn(self.strawberry, response.context_data["object_list"])
 
+    def test_unknown_slug(self):
+        response = self.client.get("/food/tags/unknown/")
+        self.assertEqual(response.status_code, 404)
+
+    def test_mysql_filters_with_exists(self):
+        request = self.factory.get(f"/food/tags/{self.slug}/")
+        queryset = self.model.objects.all()
+        with mock.patch.object(connection, "vendor", "mysql"):
+            response = tagged_object_list(request, self.slug, queryset)
+            object_list = response.context_data["object_list"]
+            self.assertIn("EXISTS", str(object_list.query))
+        self.assertEqual(list(object_list), [self.apple])
+
+    @override_settings(TAGGIT_TAG_CACHE_SIZE=100)
+    def test_tag_is_cached(self):
+        clear_tag_cache()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.get(f"/food/tags/{self.slug}/")
+        # only the objects are fetched
+        with self.assertNumQueries(1):
+            response = self.client.get(f"/food/tags/{self.slug}/")
+            self.assertEqual(list(response.context_data["object_list"]), [self.apple])
+        self.assertEqual(response.context_data["extra_context"]["tag"].name, "green")
+
+    def test_keyset_pagination(self):
+        foods = [self.apple]
+        for name in ["lime", "pear", "kiwi"]:
+            food = self.model.objects.create(name=name)
+            food.tags.add(self.slug)
+            foods.append(food)
+
+        response = self.client.get(f"/food/keyset/tags/{self.slug}/")
+        self.assertEqual(list(response.context_data["object_list"]), foods[:2])
+        self.assertTrue(response.context_data["is_paginated"])
+        next_cursor = response.context_data["next_cursor"]
+
+        response = self.client.get(
+            f"/food/keyset/tags/{self.slug}/", {"cursor": next_cursor}
+        )
+        self.assertEqual(list(response.context_data["object_list"]), foods[2:])
+        self.assertTrue(response.context_data["is_paginated"])
+        self.assertIsNone(response.context_data["next_cursor"])
+
+        response = self.client.get(
+            f"/food/keyset/tags/{self.slug}/", {"cursor": "nope"}
+        )
+        self.assertEqual(response.status_code, 404)
+
 
 class RelatedNameTests(TestCase):
     def test_default_related_name(self):
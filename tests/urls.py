@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.urls import re_path
 
-from .views import FoodTagListView
+from .views import FoodKeysetTagListView, FoodTagListView
 
 urlpatterns = [
     re_path(
@@ -9,5 +9,10 @@ urlpatterns = [
         FoodTagListView.as_view(),
         name="food-tag-list",
     ),
+    re_path(
+        r"^food/keyset/tags/(?P<slug>[a-z0-9_-]+)/$",
+        FoodKeysetTagListView.as_view(),
+        name="food-keyset-tag-list",
+    ),
     re_path(r"^admin/", admin.site.urls),
 ]
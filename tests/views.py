@@ -7,3 +7,9 @@ from .models import Food
 
 class FoodTagListView(TagListMixin, ListView):
     model = Food
+
+
+class FoodKeysetTagListView(TagListMixin, ListView):
+    model = Food
+    paginate_by = 2
+    keyset_pagination = True